@@ -2,29 +2,43 @@
 """CLI entry point for the LangGraph Helper Agent."""
 
 import argparse
+import functools
 import sys
 import warnings
+from collections import deque
+from collections.abc import Callable, Iterator
 
 from loguru import logger
 
-from src.common.constants import HEADER_WIDTH, LOG_LEVEL_MAP
+from src.common.constants import HEADER_LINE_DASH, HEADER_LINE_EQ, LOG_LEVEL_MAP, MAX_CHAT_HISTORY
+from src.common.types import ChatMessage
 
 # Suppress noisy warnings from dependencies (FAISS SWIG, Ollama sockets)
 warnings.filterwarnings("ignore", category=ResourceWarning)
-warnings.filterwarnings("ignore", message=".*SwigPy.*")
-warnings.filterwarnings("ignore", message=".*swigvarlink.*")
+warnings.filterwarnings("ignore", message=r".*(?:SwigPy|swigvarlink).*")
 
+# Route user-facing CLI output through loguru instead of stdout. With this off,
+# banners and answers stay visible whatever log level the session picks.
+USE_LOGURU_ONLY = False
 
-def configure_logging(level: str = "WARNING"):
+# Bound once at import so no call site re-checks the flag
+_emit = logger.info if USE_LOGURU_ONLY else print
+
+
+def configure_logging(level: str = "WARNING", enqueue: bool = False):
     """Configure loguru logging level.
 
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        enqueue: Hand records to a background writer thread instead of writing
+            to stderr on the calling thread. Leave off for interactive mode, where
+            output must stay in order with the input prompt.
     """
     logger.remove()
     logger.add(
         sys.stderr,
         level=level,
+        enqueue=enqueue,
         format="<level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
     )
 
@@ -42,20 +56,23 @@ def get_user_choice(prompt: str, options: list[str], default: str = None) -> str
     """
     options_str = "/".join(options)
     default_str = f" [{default}]" if default else ""
+    # Built once; retries after an invalid answer reuse the same prompt
+    full_prompt = f"{prompt} ({options_str}){default_str}: "
+    valid_choices = frozenset(o.casefold() for o in options)
 
     while True:
         try:
-            choice = input(f"{prompt} ({options_str}){default_str}: ").strip().lower()
+            choice = input(full_prompt).strip().casefold()
 
             if not choice and default:
                 return default
 
-            if choice in [o.lower() for o in options]:
+            if choice in valid_choices:
                 return choice
 
             logger.warning(f"Invalid choice. Please enter one of: {options_str}")
         except (EOFError, KeyboardInterrupt):
-            logger.info("")
+            _emit("")
             sys.exit(0)
 
 
@@ -65,9 +82,9 @@ def setup_session() -> dict:
     Returns:
         Dictionary with session configuration
     """
-    logger.info("\n" + "=" * HEADER_WIDTH)
-    logger.info("  LangGraph Helper Agent - Setup")
-    logger.info("=" * HEADER_WIDTH)
+    _emit("\n" + HEADER_LINE_EQ)
+    _emit("  LangGraph Helper Agent - Setup")
+    _emit(HEADER_LINE_EQ)
 
     # Mode selection
     mode = get_user_choice("\n1. Select mode", ["offline", "online"], default="offline")
@@ -81,13 +98,130 @@ def setup_session() -> dict:
         "3. Log level", ["quiet", "normal", "verbose", "debug"], default="quiet"
     )
 
-    logger.info("\n" + "-" * HEADER_WIDTH)
-    logger.info(f"  Mode: {mode} | Memory: {'on' if enable_memory else 'off'} | Logs: {log_level}")
-    logger.info("-" * HEADER_WIDTH)
+    _emit("\n" + HEADER_LINE_DASH)
+    _emit(f"  Mode: {mode} | Memory: {'on' if enable_memory else 'off'} | Logs: {log_level}")
+    _emit(HEADER_LINE_DASH)
 
     return {"mode": mode, "enable_memory": enable_memory, "log_level": LOG_LEVEL_MAP[log_level]}
 
 
+@functools.cache
+def _load_agent():
+    """Import the agent backend on first use.
+
+    Importing the graph pulls in LangChain, FAISS, and the LLM clients, so it is
+    deferred until a query actually needs answering.
+
+    Returns:
+        Tuple of (get_mode, set_mode, run_agent_stream)
+    """
+    from src.config import get_mode, set_mode
+    from src.graph import run_agent_stream
+
+    return get_mode, set_mode, run_agent_stream
+
+
+def _emit_streamed(tokens: Iterator[str], prefix: str = "", suffix: str = "") -> str:
+    """Show a response as its tokens arrive and return the full text.
+
+    Args:
+        tokens: Response pieces, in order
+        prefix: Text shown before the response
+        suffix: Text shown after the response
+
+    Returns:
+        The complete response
+    """
+    # Loguru records are whole lines, so the response is logged once it is complete
+    if USE_LOGURU_ONLY:
+        response = "".join(tokens)
+        _emit(f"{prefix}{response}{suffix}")
+        return response
+
+    parts = []
+    print(prefix, end="", flush=True)
+    for token in tokens:
+        parts.append(token)
+        print(token, end="", flush=True)
+    print(suffix)
+    return "".join(parts)
+
+
+def _check_vectorstore(message: str):
+    """Warn if the vector store has not been created yet.
+
+    Args:
+        message: Warning to log when the vector store is missing
+    """
+    from src.data_prep.vectorstore import vectorstore_exists
+
+    if not vectorstore_exists():
+        logger.warning(message)
+
+
+def _show_help(session: dict) -> bool:
+    """Show the current settings and available commands."""
+    _emit(f"\n  Mode: {session['mode']} | Memory: {'on' if session['enable_memory'] else 'off'}")
+    _emit("  Commands:")
+    _emit("    mode     - Switch offline/online")
+    _emit("    status   - Show current settings")
+    _emit("    clear    - Clear chat history")
+    _emit("    quit     - Exit")
+    _emit("")
+    return True
+
+
+def _show_status(session: dict) -> bool:
+    """Show the current mode, memory setting, and history size."""
+    _emit(f"\n  Mode: {session['mode']}")
+    _emit(f"  Memory: {'on' if session['enable_memory'] else 'off'}")
+    if session["chat_history"]:
+        _emit(f"  History: {len(session['chat_history'])} messages")
+    _emit("")
+    return True
+
+
+def _toggle_mode(session: dict) -> bool:
+    """Switch between offline and online mode."""
+    _, set_mode, _ = _load_agent()
+    current = session["mode"]
+    new_mode = "online" if current == "offline" else "offline"
+    set_mode(new_mode)
+    session["mode"] = new_mode
+    logger.info("Mode switched: {} -> {}", current, new_mode)
+    _emit(f"\n  Switched to {new_mode} mode\n")
+    return True
+
+
+def _clear_history(session: dict) -> bool:
+    """Clear the conversation history, if memory is enabled."""
+    if session["chat_history"] is not None:
+        session["chat_history"].clear()
+        _emit("\n  Chat history cleared\n")
+    else:
+        _emit("\n  Memory is disabled\n")
+    return True
+
+
+def _quit(session: dict) -> bool:
+    """End the interactive session."""
+    _emit("\nGoodbye!")
+    return False
+
+
+_QUIT_CMDS = frozenset({"quit", "exit", "q"})
+
+# Interactive commands: handler receives the session and returns False to exit.
+# Keys are casefolded, matching the normalized input they are looked up with.
+_COMMANDS: dict[str, Callable[[dict], bool]] = {
+    "help": _show_help,
+    "status": _show_status,
+    "mode": _toggle_mode,
+    "clear": _clear_history,
+    **dict.fromkeys(_QUIT_CMDS, _quit),
+}
+
+
 def run_interactive(mode: str, enable_memory: bool):
     """Run the agent in interactive mode.
 
@@ -95,72 +229,53 @@ def run_interactive(mode: str, enable_memory: bool):
         mode: Agent mode (offline/online)
         enable_memory: Whether to enable conversation memory
     """
-    from src.config import get_mode, set_mode
-    from src.graph import run_agent
+    get_mode, set_mode, run_agent_stream = _load_agent()
 
     set_mode(mode)
-    logger.info(f"Starting interactive mode: {mode}, memory={'on' if enable_memory else 'off'}")
+    logger.info("Starting interactive mode: {}, memory={}", mode, "on" if enable_memory else "off")
 
-    logger.info("\nReady! Type your question or 'help' for commands.\n")
+    _emit("\nReady! Type your question or 'help' for commands.\n")
 
-    chat_history = [] if enable_memory else None
+    # Bounded history: the oldest messages are evicted once MAX_CHAT_HISTORY is reached
+    session = {
+        "mode": mode,
+        "enable_memory": enable_memory,
+        "chat_history": deque(maxlen=MAX_CHAT_HISTORY) if enable_memory else None,
+    }
+    chat_history = session["chat_history"]
 
     while True:
         try:
             query = input("You: ").strip()
         except (EOFError, KeyboardInterrupt):
-            logger.info("\n\nGoodbye!")
+            _emit("\n\nGoodbye!")
             break
 
         if not query:
             continue
 
-        if query.lower() in ("quit", "exit", "q"):
-            logger.info("\nGoodbye!")
-            break
+        # Read the mode once per turn; commands and the agent call share it
+        session["mode"] = get_mode()
 
-        if query.lower() == "help":
-            logger.info(f"\n  Mode: {get_mode()} | Memory: {'on' if enable_memory else 'off'}")
-            logger.info("  Commands:")
-            logger.info("    mode     - Switch offline/online")
-            logger.info("    status   - Show current settings")
-            logger.info("    clear    - Clear chat history")
-            logger.info("    quit     - Exit")
-            logger.info("")
-            continue
-
-        if query.lower() == "status":
-            logger.info(f"\n  Mode: {get_mode()}")
-            logger.info(f"  Memory: {'on' if enable_memory else 'off'}")
-            if chat_history:
-                logger.info(f"  History: {len(chat_history)} messages")
-            logger.info("")
-            continue
-
-        if query.lower() == "mode":
-            current = get_mode()
-            new_mode = "online" if current == "offline" else "offline"
-            set_mode(new_mode)
-            logger.info(f"Mode switched: {current} -> {new_mode}")
-            logger.info(f"\n  Switched to {new_mode} mode\n")
-            continue
-
-        if query.lower() == "clear":
-            if chat_history is not None:
-                chat_history.clear()
-                logger.info("\n  Chat history cleared\n")
-            else:
-                logger.info("\n  Memory is disabled\n")
+        handler = _COMMANDS.get(query.casefold())
+        if handler:
+            if not handler(session):
+                break
             continue
 
         try:
-            logger.info(f"Processing: {query[:50]}...")
-            response = run_agent(query, mode=get_mode(), chat_history=chat_history)
-            logger.info(f"\nAssistant: {response}\n")
+            # Arguments are only formatted if the record is emitted (INFO is off by default)
+            logger.opt(lazy=True).info("Processing: {}...", lambda q=query: q[:50])
+            history = list(chat_history) if chat_history is not None else None
+            response = _emit_streamed(
+                run_agent_stream(query, mode=session["mode"], chat_history=history),
+                prefix="\nAssistant: ",
+                suffix="\n",
+            )
 
             if chat_history is not None:
-                chat_history.append({"role": "user", "content": query})
-                chat_history.append({"role": "assistant", "content": response})
+                chat_history.append(ChatMessage("user", query))
+                chat_history.append(ChatMessage("assistant", response))
 
         except Exception as e:
             logger.error(f"Error: {e}")
@@ -168,21 +283,46 @@ def run_interactive(mode: str, enable_memory: bool):
 
 def run_single_query(query: str, mode: str):
     """Run a single query and print the response."""
-    from src.config import set_mode
-    from src.graph import run_agent
+    _, set_mode, run_agent_stream = _load_agent()
 
     set_mode(mode)
-    logger.debug(f"Single query - mode: {mode}")
+    logger.debug("Single query - mode: {}", mode)
 
     try:
-        response = run_agent(query, mode=mode)
-        print(response)
+        _emit_streamed(run_agent_stream(query, mode=mode))
     except Exception as e:
         logger.error(f"Error: {e}")
         sys.exit(1)
 
 
+def _fast_path_query() -> str | None:
+    """Return the query if the command line is just a single positional argument.
+
+    This is the most common invocation, and it needs no argument parser.
+
+    Returns:
+        The query string, or None if full argument parsing is required
+    """
+    argv = sys.argv[1:]
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        return argv[0]
+    return None
+
+
+def _run_quick_query(query: str, mode: str):
+    """Answer a single query without the interactive setup."""
+    configure_logging("WARNING", enqueue=True)
+    _check_vectorstore("Vector store not found")
+    run_single_query(query, mode)
+
+
 def main():
+    # Fast path: `python main.py "question"` skips building the argument parser
+    query = _fast_path_query()
+    if query:
+        _run_quick_query(query, "offline")
+        return
+
     parser = argparse.ArgumentParser(
         description="LangGraph Helper Agent - AI assistant for LangGraph and LangChain",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -212,24 +352,12 @@ First-time setup:
 
     # Quick query mode - no setup, just answer
     if args.query:
-        configure_logging("WARNING")
-
-        from src.data_prep.vectorstore import vectorstore_exists
-
-        if not vectorstore_exists():
-            logger.warning("Vector store not found")
-
-        run_single_query(args.query, args.mode)
+        _run_quick_query(args.query, args.mode)
     else:
         # Interactive mode - run setup first
         config = setup_session()
         configure_logging(config["log_level"])
-
-        from src.data_prep.vectorstore import vectorstore_exists
-
-        if not vectorstore_exists():
-            logger.warning("Vector store not found. Run 'python scripts/prepare_data.py' first.")
-
+        _check_vectorstore("Vector store not found. Run 'python scripts/prepare_data.py' first.")
         run_interactive(config["mode"], config["enable_memory"])
 
 
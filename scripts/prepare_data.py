@@ -19,11 +19,10 @@ from loguru import logger
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.common.constants import HEADER_WIDTH  # noqa: E402
-from src.config import VECTORSTORE_DIR  # noqa: E402
-from src.data_prep.chunker import chunk_documents  # noqa: E402
-from src.data_prep.downloader import download_docs, get_all_docs  # noqa: E402
-from src.data_prep.preprocessor import preprocess_all_docs  # noqa: E402
+from src.common.constants import HEADER_LINE_EQ  # noqa: E402
+from src.config import DOC_FILES, VECTORSTORE_DIR  # noqa: E402
+from src.data_prep.chunker import iter_chunks  # noqa: E402
+from src.data_prep.downloader import download_docs, iter_docs  # noqa: E402
 from src.data_prep.vectorstore import create_vectorstore, vectorstore_exists  # noqa: E402
 
 
@@ -40,9 +39,8 @@ def main():
     )
     args = parser.parse_args()
 
-    logger.info("=" * HEADER_WIDTH)
-    logger.info("LangGraph Helper Agent - Data Preparation")
-    logger.info("=" * HEADER_WIDTH)
+    # Multi-line blocks are logged as one record: one write to stderr instead of one per line
+    logger.info(f"{HEADER_LINE_EQ}\nLangGraph Helper Agent - Data Preparation\n{HEADER_LINE_EQ}")
 
     # Step 1: Download documentation
     logger.info("\n[1/3] Downloading documentation files...")
@@ -59,41 +57,37 @@ def main():
         logger.info("\n--download-only specified, skipping vector store creation")
         return
 
-    # Step 2: Load and preprocess docs
+    # Step 2: Load and preprocess docs. Each file is preprocessed and chunked by one
+    # worker process, and its chunks are embedded as they arrive.
     logger.info("\n[2/3] Loading and preprocessing documentation...")
-    docs = get_all_docs()
-    if not docs:
+    if not any(filepath.exists() for filepath in DOC_FILES.values()):
         logger.error("No documentation files found")
         sys.exit(1)
 
-    if args.no_preprocess:
-        logger.info("  Skipping preprocessing (--no-preprocess)")
-    else:
+    preprocess = not args.no_preprocess
+    if preprocess:
         logger.info("  Preprocessing: removing JS/TS, cleaning markdown, filtering...")
-        docs = preprocess_all_docs(docs)
-
-    total_chars = sum(len(c) for c in docs.values())
-    logger.info(f"  Total content: {total_chars:,} characters across {len(docs)} files")
+    else:
+        logger.info("  Skipping preprocessing (--no-preprocess)")
 
     # Step 3: Create vector store
     logger.info("\n[3/3] Creating vector store...")
 
     if vectorstore_exists() and not args.force:
-        logger.info(f"  Vector store already exists at {VECTORSTORE_DIR}")
-        logger.info("  Use --force to rebuild")
+        logger.info(f"  Vector store already exists at {VECTORSTORE_DIR}\n  Use --force to rebuild")
         return
 
-    chunks = chunk_documents(docs)
-    logger.info(f"  Created {len(chunks)} chunks")
-
+    chunks = iter_chunks(iter_docs(), preprocess=preprocess)
     create_vectorstore(chunks, VECTORSTORE_DIR)
 
-    logger.info("\n" + "=" * HEADER_WIDTH)
-    logger.info("Data preparation complete!")
-    logger.info("=" * HEADER_WIDTH)
-    logger.info("\nYou can now run the agent:")
-    logger.info("  python main.py                    # Interactive mode")
-    logger.info("  python main.py 'Your question'    # Quick query")
+    logger.info(
+        f"\n{HEADER_LINE_EQ}\n"
+        "Data preparation complete!\n"
+        f"{HEADER_LINE_EQ}\n"
+        "\nYou can now run the agent:\n"
+        "  python main.py                    # Interactive mode\n"
+        "  python main.py 'Your question'    # Quick query"
+    )
 
 
 if __name__ == "__main__":
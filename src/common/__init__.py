@@ -1,21 +1,34 @@
-"""Common constants and configurations for the LangGraph Helper Agent."""
-
-from .constants import (
-    CHUNK_OVERLAP,
-    CHUNK_SIZE,
-    DEFAULT_QUERY_TYPE,
-    DOC_URLS,
-    MAX_SEARCH_RESULTS,
-    TOP_K_RESULTS,
-    VALID_QUERY_TYPES,
-)
-from .llm_constants import EMBEDDING_MODEL
-from .prompts import (
-    CLASSIFICATION_PROMPT,
-    SYSTEM_PROMPT,
-)
+"""Common constants and configurations for the LangGraph Helper Agent.
+
+Re-exported names are resolved lazily (PEP 562) so importing one constant does
+not load every submodule, e.g. the prompt templates.
+"""
+
+import importlib
+
+# Maps each re-exported name to the submodule that defines it
+_LAZY_MAP = {
+    # General constants
+    "DOC_URLS": "constants",
+    "CHUNK_SIZE": "constants",
+    "CHUNK_OVERLAP": "constants",
+    "TOP_K_RESULTS": "constants",
+    "MAX_SEARCH_RESULTS": "constants",
+    "VALID_QUERY_TYPES": "constants",
+    "DEFAULT_QUERY_TYPE": "constants",
+    # LLM constants (LLM config is now in config.yaml)
+    "EMBEDDING_MODEL": "llm_constants",
+    # Prompts
+    "CLASSIFICATION_PROMPT": "prompts",
+    "SYSTEM_PROMPT": "prompts",
+    "USER_PROMPT": "prompts",
+    # Types
+    "ChatMessage": "types",
+    "Chunk": "types",
+}
 
-__all__ = [
+# Nothing star-imports this package; __all__ documents the public names for __dir__
+__all__ = (
     # General constants
     "DOC_URLS",
     "CHUNK_SIZE",
@@ -29,4 +42,23 @@ __all__ = [
     # Prompts
     "CLASSIFICATION_PROMPT",
     "SYSTEM_PROMPT",
-]
+    "USER_PROMPT",
+    # Types
+    "ChatMessage",
+    "Chunk",
+)
+
+
+def __getattr__(name: str):
+    """Import the defining submodule on first access and cache the value."""
+    if name not in _LAZY_MAP:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_LAZY_MAP[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
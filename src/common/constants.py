@@ -1,5 +1,7 @@
 """General constants for the LangGraph Helper Agent."""
 
+import re
+
 # Documentation URLs (from LangGraph llms.txt overview)
 DOC_URLS = {
     "langgraph": "https://langchain-ai.github.io/langgraph/llms.txt",
@@ -12,6 +14,7 @@ DOC_URLS = {
 CHUNK_SIZE = 2000
 CHUNK_OVERLAP = 200
 MIN_CHUNK_SIZE = 100  # Minimum chunk size (filters out header-only chunks)
+SPLITTER_CACHE_SIZE = 16  # Distinct (chunk_size, chunk_overlap) splitters kept
 
 # Markdown separators for text splitting (in order of preference)
 MARKDOWN_SEPARATORS = [
@@ -24,6 +27,8 @@ MARKDOWN_SEPARATORS = [
     " ",  # Words
     "",  # Characters
 ]
+# Header separators start a new section, so chunks cut there get no overlap
+MARKDOWN_HEADER_SEPARATORS = frozenset(MARKDOWN_SEPARATORS[:3])
 
 # Retrieval configuration
 TOP_K_RESULTS = 8
@@ -31,38 +36,65 @@ TOP_K_RESULTS = 8
 # Web search configuration
 MAX_SEARCH_RESULTS = 3
 DDGS_REGION = "wt-wt"  # No region bias for DuckDuckGo
+WEB_SEARCH_CACHE_SIZE = 1024  # Distinct search queries kept in memory
+WEB_SEARCH_CACHE_TTL = 300  # Seconds before a cached search is repeated
 
 # Query classification
-VALID_QUERY_TYPES = {"langgraph", "langchain", "code_example", "general"}
+VALID_QUERY_TYPES = frozenset({"langgraph", "langchain", "code_example", "general"})
 DEFAULT_QUERY_TYPE = "langgraph"
+CLASSIFICATION_CACHE_SIZE = 4096  # Distinct normalized queries whose label is kept
 
 # Input validation limits
 MAX_QUERY_LENGTH = 2000  # Maximum characters in a query
 MAX_CHAT_HISTORY = 20  # Maximum number of messages to keep in history
 MAX_TOTAL_DOCS = 15  # Maximum total documents after multi-query search
 CHAT_HISTORY_CONTEXT_LENGTH = 6  # Number of recent messages to include in prompt
+MAX_CONTEXT_CHARS = 24000  # Cap on retrieved context sent to the LLM (~6k tokens)
 
 # Document deduplication
-DEDUP_KEY_LENGTH = 200  # Characters used as dedup key for documents
 MIN_SECTION_LENGTH = 50  # Minimum section length for dedup
 DEDUP_SIGNATURE_LENGTH = 200  # Characters used as signature for section dedup
+DEDUP_DIGEST_SIZE = 8  # Bytes of the blake2b digest, stored as an int per section signature
 
 # Vectorstore configuration
 VECTORSTORE_BATCH_SIZE = 100  # Batch size for embedding documents
+EMBEDDING_CONCURRENCY = 4  # Embedding batches in flight to the Ollama server at once
+EMBEDDING_CACHE_DIGEST_SIZE = 16  # Bytes of the blake2b chunk digest keying cached vectors
+HNSW_M = 32  # Neighbors per node in the HNSW graph index
+HNSW_EF_CONSTRUCTION = 200  # Candidate list size while building the HNSW graph
+HNSW_EF_SEARCH = 64  # Candidate list size per query (recall vs. latency)
 
 # Download configuration
 DOWNLOAD_TIMEOUT = 60  # HTTP request timeout in seconds
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk when streaming downloads to disk
 
 # Preprocessing configuration
 MAX_CONSECUTIVE_BLANK_LINES = 4  # Max blank lines before cleanup
+PREPROCESS_CACHE_VERSION = 6  # Bump whenever preprocessing output changes to invalidate the cache
+PREPROCESS_CACHE_DIGEST_SIZE = 16  # Bytes of the blake2b content digest used as cache key
 
 # Code block patterns for preprocessing
 EMPTY_CODE_BLOCK_PATTERN = r"```\w*\s*```"
 WHITESPACE_CODE_BLOCK_PATTERN = r"```\w*\n\s*```"
+# Removed before the JS noise filter, whose fence tracking would otherwise be
+# inverted by a fence that opens and closes on one line
+EMPTY_CODE_BLOCK_RE = re.compile(EMPTY_CODE_BLOCK_PATTERN)
+WHITESPACE_CODE_BLOCK_RE = re.compile(WHITESPACE_CODE_BLOCK_PATTERN)
+
+# Inline JavaScript/TypeScript noise outside code blocks (matched per stripped line)
+JS_NOISE_PATTERNS = [
+    r'^import \{[^}]+\} from ["\']@[^"\']+["\'];?\s*$',  # import { x } from "@langchain/..."
+    r"^const \w+\s*=\s*new \w+\([^)]*\);?\s*$",  # const x = new Something()
+    r"^let \w+\s*[:=]",  # let x = or let x:
+    r"^export (?:const|function|class|interface|type)\s",  # export declarations
+    r"^\s*\w+:\s*(?:string|number|boolean|any)\[?\]?,?\s*$",  # TypeScript type annotations
+]
+# One alternation, so each line costs a single match call instead of one per pattern
+JS_NOISE_RE = re.compile("|".join(f"(?:{pattern})" for pattern in JS_NOISE_PATTERNS), re.IGNORECASE)
 
 # Navigation and boilerplate patterns to remove
 NAVIGATION_REMOVAL_PATTERNS = [
-    r"^\s*[\w\s]+>\s*[\w\s]+>\s*[\w\s]+\s*$",  # Breadcrumbs
+    r"^[\w \t]+>[\w \t]+>[\w \t]+$",  # Breadcrumbs
     r"^\s*-\s*\[.*?\]\(#.*?\)\s*$",  # TOC links
     r"On this page\s*\n(?:\s*-\s*\[.*?\].*?\n)+",  # "On this page" sections
     r"Skip to (?:main )?content",  # "Skip to content" links
@@ -73,6 +105,78 @@ NAVIGATION_REMOVAL_PATTERNS = [
     r"(?:---\s*){2,}",  # Repeated separator lines
 ]
 
+# Markdown cleanup patterns
+# Spelled out as a literal run plus "+" (not "\n{N,}") so the engine can scan for the
+# literal prefix; about 10x faster than the counted-repeat form
+EXCESS_BLANK_LINES_RE = re.compile("\n" * MAX_CONSECUTIVE_BLANK_LINES + "+")
+BROKEN_LINK_RE = re.compile(r"\[([^\]]+)\]\(\s*\)")
+HTML_COMMENT_PATTERN = r"<!--.*?-->"
+HTML_TAG_PATTERNS = [r"<(?:div|span|p|br|hr)[^>]*/?>", r"</(?:div|span|p)>"]
+
+# Fences of a code block without a language tag (candidate for Python detection)
+GENERIC_CODE_FENCE_OPEN = "```\n"
+CODE_FENCE = "```"
+
+# Header lines (H1-H4) used to split documents into sections; the group keeps headers
+SECTION_HEADER_SPLIT_RE = re.compile(r"(^#{1,4}\s+.+$)", re.MULTILINE)
+NON_WHITESPACE_RE = re.compile(r"\S")
+
+# Sections that are not useful for retrieval
+IRRELEVANT_CONTENT_PATTERNS = [
+    # API reference with just type signatures (no examples)
+    r"#{2,4}\s+(?:Parameters|Returns|Raises|Attributes)\s*\n(?:\s*[-*]\s+\*\*\w+\*\*[^\n]*\n)+",
+    # Long lists of just links
+    r"(?:^\s*[-*]\s+\[[\w\s]+\]\([^)]+\)\s*$\n){5,}",
+]
+
+# Titles of whole sections that are not useful for retrieval: version/changelog
+# sections and installation for other languages. A section opened by such an H2-H4
+# header runs until the next H1-H3 header.
+IRRELEVANT_SECTION_TITLE_RE = re.compile(
+    r"Changelog|Version History|Release Notes|(?:npm|yarn|pnpm)\s+install", re.IGNORECASE
+)
+IRRELEVANT_SECTION_MIN_LEVEL = 2
+IRRELEVANT_SECTION_END_LEVEL = 3
+
+# Every pure deletion, each scoped with its own inline flags and paired with lowercase
+# marker substrings. A pattern cannot match unless one of its markers occurs in the
+# lowercased text, so documents lacking every marker skip that pattern's scan.
+BOILERPLATE_REMOVAL_RULES: list[tuple[str, tuple[str, ...]]] = [
+    *zip(
+        (f"(?im:{pattern})" for pattern in NAVIGATION_REMOVAL_PATTERNS),
+        [
+            (">",),
+            ("](#",),
+            ("on this page",),
+            ("skip to ",),
+            ("previous:", "next:"),
+            ("[edit ",),
+            ("was this ",),
+            ("[](",),
+            ("---",),
+        ],
+        strict=True,
+    ),
+    (f"(?s:{HTML_COMMENT_PATTERN})", ("<!--",)),
+    *((f"(?i:{pattern})", ("<",)) for pattern in HTML_TAG_PATTERNS),
+    *zip(
+        (f"(?ims:{pattern})" for pattern in IRRELEVANT_CONTENT_PATTERNS),
+        [
+            ("parameters", "returns", "raises", "attributes"),
+            ("](",),
+        ],
+        strict=True,
+    ),
+]
+
+# Lookahead placed before the fused removal patterns: a position is only tried
+# against the alternatives if it holds a character some pattern can start with, or
+# begins a line (for the anchored ones). One class test replaces trying every branch
+# at every position. It must cover every rule's possible first characters;
+# tests/test_preprocessor.py compares each rule with and without it on sample text.
+# \u017f is the long s, which IGNORECASE matches against "s".
+BOILERPLATE_LEAD_PATTERN = r"(?=[<#\[\-OoSsPpNnWw\u017f]|(?m:^))"
+
 # Python code indicators for detecting Python in generic code blocks
 PYTHON_CODE_INDICATORS = [
     "import ",
@@ -93,8 +197,21 @@ PYTHON_CODE_INDICATORS = [
     "False",
 ]
 
+# Matches if any Python indicator occurs in a code block (one scan instead of one per
+# indicator). Indicators containing a shorter one (e.g. "@tool" contains "@") can never
+# change the result, so they are left out of the alternation.
+PYTHON_CODE_INDICATOR_RE = re.compile(
+    "|".join(
+        re.escape(indicator)
+        for indicator in PYTHON_CODE_INDICATORS
+        if not any(other != indicator and other in indicator for other in PYTHON_CODE_INDICATORS)
+    )
+)
+
 # UI/Display configuration
 HEADER_WIDTH = 60  # Width of separator lines in CLI output
+HEADER_LINE_EQ = "=" * HEADER_WIDTH
+HEADER_LINE_DASH = "-" * HEADER_WIDTH
 
 # Logging level mapping
 LOG_LEVEL_MAP = {
@@ -119,3 +236,8 @@ SUSPICIOUS_PATTERNS = [
     "jailbreak",
     "bypass your",
 ]
+
+# All suspicious patterns as one alternation (single scan per query). Matched
+# case-sensitively against the lowercased query: IGNORECASE makes the engine fold
+# every character it compares, which is several times slower than one lower().
+SUSPICIOUS_PATTERN_RE = re.compile("|".join(re.escape(pattern) for pattern in SUSPICIOUS_PATTERNS))
@@ -20,3 +20,12 @@ OPENROUTER_DEFAULT_MAX_RETRIES = 3  # Maximum retry attempts
 # Ollama configuration
 OLLAMA_DEFAULT_BASE_URL = "http://localhost:11434"
 OLLAMA_DEFAULT_TIMEOUT = 60  # Request timeout in seconds
+
+# HTTP connection pool for LLM requests (shared per process, see llm_client.client)
+HTTP_MAX_CONNECTIONS = 100  # Open sockets across all concurrent requests
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 40  # Idle sockets kept for reuse
+HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle socket is kept open
+
+# Batched requests (UnifiedLLMClient.ainvoke_many) are grouped by max_tokens into
+# bins this many tokens wide; each bin is dispatched together
+LLM_BATCH_BIN_WIDTH = 128
@@ -10,6 +10,9 @@ Question: {query}
 
 Respond with ONLY the category name (langgraph, langchain, code_example, or general), nothing else."""
 
+# The system prompt is fully static so providers can cache it across turns and
+# sessions. Everything that changes per call goes in USER_PROMPT, ordered from
+# least to most volatile: retrieved context, chat history, then the question.
 SYSTEM_PROMPT = """You are an expert assistant specializing in LangGraph and LangChain for Python.
 Your role is to help Python developers understand and implement solutions using these frameworks.
 
@@ -36,11 +39,13 @@ Guidelines:
 - Include Python code examples from the context when relevant
 - Format code using markdown code blocks with ```python
 - Be concise but thorough
+"""
 
-=== DOCUMENTATION CONTEXT (USE THIS!) ===
+USER_PROMPT = """=== DOCUMENTATION CONTEXT (USE THIS!) ===
 {context}
 === END CONTEXT ===
 
 Chat History:
 {chat_history}
-"""
+
+User Question: {query}"""
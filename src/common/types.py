@@ -0,0 +1,18 @@
+"""Shared lightweight types for the LangGraph Helper Agent."""
+
+from typing import Any, NamedTuple
+
+# A text chunk and its metadata, kept as plain data until the vector store boundary
+Chunk = tuple[str, dict[str, Any]]
+
+
+class ChatMessage(NamedTuple):
+    """A single conversation turn kept in chat history.
+
+    Attributes:
+        role: Message author ("user" or "assistant")
+        content: Message text
+    """
+
+    role: str
+    content: str
@@ -1,5 +1,6 @@
 """Configuration management for the LangGraph Helper Agent."""
 
+import functools
 import os
 import threading
 from pathlib import Path
@@ -8,23 +9,36 @@ from dotenv import load_dotenv
 
 from src.common.constants import DOC_URLS
 
+
+@functools.cache
+def load_env_file() -> None:
+    """Load environment variables from the .env file at most once per process.
+
+    Existing environment variables are never overridden.
+    """
+    load_dotenv()
+
+
 # Load environment variables from .env file
-load_dotenv()
+load_env_file()
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 VECTORSTORE_DIR = DATA_DIR / "vectorstore"
+PREPROCESS_CACHE_DIR = DATA_DIR / "cache" / "preprocessed"
+EMBEDDING_CACHE_DIR = DATA_DIR / "cache" / "embeddings"
 
-# Document file paths (derived from DOC_URLS keys)
-DOC_FILES = {
-    "langgraph": DATA_DIR / "langgraph-llms.txt",
-    "langgraph_full": DATA_DIR / "langgraph-llms-full.txt",
-    "langchain": DATA_DIR / "langchain-llms.txt",
-    "langchain_full": DATA_DIR / "langchain-llms-full.txt",
-}
+# Document file names (derived from DOC_URLS keys). DOC_FILES maps them to full
+# paths and is built on first access, since only data preparation needs it.
+_DOC_FILENAMES = (
+    ("langgraph", "langgraph-llms.txt"),
+    ("langgraph_full", "langgraph-llms-full.txt"),
+    ("langchain", "langchain-llms.txt"),
+    ("langchain_full", "langchain-llms-full.txt"),
+)
 
-# Agent configuration (thread-safe)
+# Agent configuration. Reads of the module global are atomic, so only writes take the lock.
 _mode_lock = threading.Lock()
 _agent_mode = os.getenv("AGENT_MODE", "offline").lower()
 
@@ -32,23 +46,37 @@ __all__ = [
     "PROJECT_ROOT",
     "DATA_DIR",
     "VECTORSTORE_DIR",
+    "PREPROCESS_CACHE_DIR",
+    "EMBEDDING_CACHE_DIR",
     "DOC_URLS",
-    "DOC_FILES",
+    "DOC_FILES",  # noqa: F822 - built lazily by __getattr__
     "get_mode",
     "set_mode",
+    "load_env_file",
 ]
 
 
+def __getattr__(name: str):
+    """Build DOC_FILES on first access and cache it as a module attribute."""
+    if name != "DOC_FILES":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    doc_files = {doc: DATA_DIR / filename for doc, filename in _DOC_FILENAMES}
+    globals()["DOC_FILES"] = doc_files
+    return doc_files
+
+
 def get_mode() -> str:
-    """Get the current agent mode (thread-safe)."""
-    with _mode_lock:
-        return _agent_mode
+    """Get the current agent mode (thread-safe, lock-free read)."""
+    return _agent_mode
 
 
 def set_mode(mode: str) -> None:
     """Set the agent mode dynamically (thread-safe)."""
     global _agent_mode
-    if mode.lower() not in ("offline", "online"):
+    mode = mode.lower()
+    if mode not in ("offline", "online"):
         raise ValueError("Mode must be 'offline' or 'online'")
+    # Rebinding the global is a single atomic store; the lock orders concurrent writers
     with _mode_lock:
-        _agent_mode = mode.lower()
+        _agent_mode = mode
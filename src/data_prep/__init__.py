@@ -1,14 +1,38 @@
-"""Data preparation utilities for the LangGraph Helper Agent."""
+"""Data preparation utilities for the LangGraph Helper Agent.
 
-from .chunker import chunk_documents
-from .downloader import download_docs
-from .preprocessor import preprocess_all_docs
-from .vectorstore import create_vectorstore, load_vectorstore
+Re-exported names are resolved lazily (PEP 562) so the query path, which only
+needs the vector store, does not load the downloader, preprocessor, or chunker.
+"""
 
-__all__ = [
+import importlib
+
+# Maps each re-exported name to the submodule that defines it
+_LAZY_MAP = {
+    "download_docs": "downloader",
+    "chunk_documents": "chunker",
+    "create_vectorstore": "vectorstore",
+    "load_vectorstore": "vectorstore",
+}
+
+# Nothing star-imports this package; __all__ documents the public names for __dir__
+__all__ = (
     "download_docs",
-    "preprocess_all_docs",
     "chunk_documents",
     "create_vectorstore",
     "load_vectorstore",
-]
+)
+
+
+def __getattr__(name: str):
+    """Import the defining submodule on first access and cache the value."""
+    if name not in _LAZY_MAP:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_LAZY_MAP[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
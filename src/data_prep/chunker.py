@@ -1,22 +1,142 @@
 """Text chunking for documentation files."""
 
+import functools
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from loguru import logger
 
 from src.common.constants import (
     CHUNK_OVERLAP,
     CHUNK_SIZE,
+    MARKDOWN_HEADER_SEPARATORS,
     MARKDOWN_SEPARATORS,
     MIN_CHUNK_SIZE,
+    SPLITTER_CACHE_SIZE,
 )
+from src.common.types import Chunk
+from src.data_prep.preprocessor import preprocess_document_cached
+
+
+class SinglePassSplitter:
+    """Greedy single-pass text splitter for markdown documentation.
+
+    Each chunk is cut at the highest-priority separator found within
+    ``chunk_size`` characters, searching with ``str.rfind`` so every boundary
+    lookup runs in C. Separators are kept at the start of the following chunk.
+    Text is never re-scanned the way the recursive splitter re-splits oversized
+    pieces.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        chunk_overlap: int = CHUNK_OVERLAP,
+        separators: list[str] = MARKDOWN_SEPARATORS,
+    ):
+        """Initialize the splitter.
+
+        Args:
+            chunk_size: Maximum size of each chunk
+            chunk_overlap: Number of characters to overlap between chunks
+            separators: Separators in order of preference
+
+        Raises:
+            ValueError: If the overlap is not smaller than the chunk size
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(
+                f"Chunk overlap ({chunk_overlap}) must be smaller than chunk size ({chunk_size})"
+            )
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # The empty separator means "cut anywhere", which is the fallback below
+        self.separators = tuple(sep for sep in separators if sep)
+
+    def _find_cut(self, text: str, lower: int, end: int) -> tuple[int, str]:
+        """Find where to end the current chunk.
+
+        Args:
+            text: Text being split
+            lower: Offset the cut must lie past: the start of the current chunk, or
+                the end of the previous one if that is later (inside the overlap)
+            end: Furthest allowed end offset
+
+        Returns:
+            Tuple of (cut offset, separator found there or "" for a hard cut)
+        """
+        for sep in self.separators:
+            cut = text.rfind(sep, lower + 1, end)
+            if cut != -1:
+                return cut, sep
+        return end, ""
+
+    def _overlap_start(self, text: str, start: int, cut: int) -> int:
+        """Pick where the next chunk starts so it repeats the tail of this one.
+
+        Args:
+            text: Text being split
+            start: Start offset of the current chunk
+            cut: End offset of the current chunk
+
+        Returns:
+            Start offset of the next chunk
+        """
+        lower = max(cut - self.chunk_overlap, start + 1)
+        # Begin the overlap on a word boundary rather than mid-word
+        space = text.find(" ", lower, cut)
+        return space + 1 if space != -1 else cut
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into chunks of at most ``chunk_size`` characters.
+
+        Args:
+            text: The text to split
+
+        Returns:
+            List of non-empty, whitespace-stripped chunks
+        """
+        chunks = []
+        start = 0
+        prev_cut = 0
+        length = len(text)
+
+        while start < length:
+            end = start + self.chunk_size
+            if end >= length:
+                cut, sep = length, ""
+            else:
+                # Only cut past the previous chunk's end: cutting inside the overlap
+                # again would emit a chunk that is just the previous chunk's tail
+                cut, sep = self._find_cut(text, max(start, prev_cut), end)
+            prev_cut = cut
+
+            chunk = text[start:cut].strip()
+            if chunk:
+                chunks.append(chunk)
+
+            # Sections cut at a header stand alone; other cuts carry some overlap
+            if cut < length and self.chunk_overlap and sep not in MARKDOWN_HEADER_SEPARATORS:
+                start = self._overlap_start(text, start, cut)
+            else:
+                start = cut
+
+        return chunks
 
 
+@functools.lru_cache(maxsize=SPLITTER_CACHE_SIZE)
 def create_splitter(
     chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP
-) -> RecursiveCharacterTextSplitter:
+) -> SinglePassSplitter:
     """Create a text splitter configured for markdown documentation.
 
+    Splitters hold no per-call state, so one instance per size pair is shared.
+
     Args:
         chunk_size: Maximum size of each chunk
         chunk_overlap: Number of characters to overlap between chunks
@@ -24,12 +144,8 @@ def create_splitter(
     Returns:
         Configured text splitter
     """
-    return RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=MARKDOWN_SEPARATORS,
-        keep_separator=True,
+    return SinglePassSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=MARKDOWN_SEPARATORS
     )
 
 
@@ -39,9 +155,12 @@ def chunk_text(
     chunk_size: int = CHUNK_SIZE,
     chunk_overlap: int = CHUNK_OVERLAP,
     min_chunk_size: int = MIN_CHUNK_SIZE,
-) -> list[Document]:
+) -> list[Chunk]:
     """Split text into chunks with metadata.
 
+    Chunks are plain (text, metadata) tuples; use to_documents() where LangChain
+    Document objects are required.
+
     Args:
         text: The text content to chunk
         source: Source identifier for metadata
@@ -50,41 +169,89 @@ def chunk_text(
         min_chunk_size: Minimum chunk size (filters out header-only chunks)
 
     Returns:
-        List of Document objects with chunked content
+        List of (chunk text, metadata) tuples
     """
     splitter = create_splitter(chunk_size, chunk_overlap)
 
-    # Create a single document and split it
-    doc = Document(page_content=text, metadata={"source": source})
-    chunks = splitter.split_documents([doc])
+    # Filter out tiny chunks (usually just headers); split_text already strips them
+    texts = [t for t in splitter.split_text(text) if len(t) >= min_chunk_size]
+
+    return [(t, {"source": source, "chunk_index": i}) for i, t in enumerate(texts)]
+
+
+def to_documents(chunks: Iterable[Chunk]) -> list[Document]:
+    """Wrap (text, metadata) chunks in LangChain Document objects.
+
+    Args:
+        chunks: Chunks as produced by chunk_text
+
+    Returns:
+        List of Document objects
+    """
+    return [Document(page_content=text, metadata=metadata) for text, metadata in chunks]
+
 
-    # Filter out tiny chunks (usually just headers)
-    chunks = [c for c in chunks if len(c.page_content.strip()) >= min_chunk_size]
+def _chunk_source(doc: tuple[str, str], preprocess: bool = False) -> tuple[str, list[Chunk]]:
+    """Chunk one (source, content) pair; module-level so worker processes can run it."""
+    source, content = doc
+    if preprocess:
+        logger.info(f"Preprocessing {source}...")
+        content = preprocess_document_cached(content, source)
+    return source, chunk_text(content, source)
 
-    # Add chunk index to metadata
-    for i, chunk in enumerate(chunks):
-        chunk.metadata["chunk_index"] = i
-        chunk.metadata["total_chunks"] = len(chunks)
 
+def iter_chunks(
+    docs: Iterable[tuple[str, str]], processes: int | None = None, preprocess: bool = False
+) -> Iterator[Chunk]:
+    """Chunk documents in parallel, yielding chunks as each source finishes.
+
+    Sources are independent and preprocessing and chunking are CPU-bound, so
+    each source is handled start to finish by one worker process of a single
+    pool. Results arrive in input order. At most ``processes`` documents are
+    handed to the pool at once, and the next one is read from ``docs`` only as
+    the oldest finishes, so memory holds a bounded window of the corpus.
+
+    Args:
+        docs: Iterable of (source name, document content) pairs
+        processes: Number of worker processes (defaults to the CPU count)
+        preprocess: Run the preprocessing pipeline on each document before chunking
+
+    Yields:
+        (chunk text, metadata) tuples, source by source
+    """
+    processes = processes or os.cpu_count() or 1
+    worker = functools.partial(_chunk_source, preprocess=preprocess)
+    pending: deque[AsyncResult] = deque()
+
+    with Pool(processes) as pool:
+        for doc in docs:
+            pending.append(pool.apply_async(worker, (doc,)))
+            if len(pending) >= processes:
+                yield from _log_chunks(*pending.popleft().get())
+        while pending:
+            yield from _log_chunks(*pending.popleft().get())
+
+
+def _log_chunks(source: str, chunks: list[Chunk]) -> list[Chunk]:
+    """Log how many chunks a source produced and pass them through."""
+    logger.info(f"Created {len(chunks)} chunks from {source}")
     return chunks
 
 
-def chunk_documents(docs: dict[str, str]) -> list[Document]:
+def chunk_documents(docs: dict[str, str]) -> list[Chunk]:
     """Chunk multiple documents.
 
     Args:
         docs: Dictionary mapping source names to document content
 
     Returns:
-        List of all Document chunks from all sources
+        List of all (chunk text, metadata) tuples from all sources
     """
     all_chunks = []
-
-    for source, content in docs.items():
-        logger.info(f"Chunking {source}...")
-        chunks = chunk_text(content, source)
-        logger.info(f"Created {len(chunks)} chunks")
-        all_chunks.extend(chunks)
+    if docs:
+        logger.info(f"Chunking {len(docs)} documents...")
+        processes = min(len(docs), os.cpu_count() or 1)
+        all_chunks.extend(iter_chunks(docs.items(), processes))
 
     logger.info(f"Total chunks: {len(all_chunks)}")
     return all_chunks
@@ -96,6 +263,6 @@ if __name__ == "__main__":
     docs = get_all_docs()
     if docs:
         chunks = chunk_documents(docs)
-        logger.info(f"Sample chunk:\n{chunks[0].page_content[:500]}...")
+        logger.info(f"Sample chunk:\n{chunks[0][0][:500]}...")
     else:
         logger.warning("No docs found. Run downloader first.")
@@ -1,11 +1,15 @@
 """Download llms.txt documentation files."""
 
+import codecs
+import functools
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import requests
 from loguru import logger
 
-from src.common.constants import DOWNLOAD_TIMEOUT
+from src.common.constants import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT
 from src.config import DATA_DIR, DOC_FILES, DOC_URLS
 
 
@@ -21,15 +25,27 @@ def download_file(url: str, filepath: Path) -> bool:
     """
     try:
         logger.info(f"Downloading {url}...")
-        response = requests.get(url, timeout=DOWNLOAD_TIMEOUT)
-        response.raise_for_status()
-
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        filepath.write_text(response.text, encoding="utf-8")
-
-        logger.info(f"Saved to {filepath} ({len(response.text):,} bytes)")
+        # Stream the body straight to disk instead of holding it (and a decoded copy) in memory
+        with requests.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a side file so an interrupted download never looks complete
+            partial = filepath.with_name(f"{filepath.name}.part")
+            size = 0
+            with partial.open("wb") as f:
+                chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+                # Store BOM-less UTF-8 so the text never starts with a stray U+FEFF
+                first = next(chunks, b"").removeprefix(codecs.BOM_UTF8)
+                size += f.write(first)
+                for chunk in chunks:
+                    size += f.write(chunk)
+            partial.replace(filepath)
+
+        logger.info(f"Saved to {filepath} ({size:,} bytes)")
         return True
     except requests.RequestException as e:
+        filepath.with_name(f"{filepath.name}.part").unlink(missing_ok=True)
         logger.error(f"Failed to download {url}: {e}")
         return False
 
@@ -46,6 +62,7 @@ def download_docs(force: bool = False) -> dict[str, bool]:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     results = {}
+    pending = {}
     for name, url in DOC_URLS.items():
         filepath = DOC_FILES[name]
 
@@ -54,9 +71,64 @@ def download_docs(force: bool = False) -> dict[str, bool]:
             results[name] = True
             continue
 
-        results[name] = download_file(url, filepath)
+        pending[name] = (url, filepath)
+
+    if not pending:
+        return results
+
+    # Files are about to be rewritten, so drop any cached content
+    _read_doc.cache_clear()
+
+    # Downloads are network-bound, so fetch them concurrently
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        futures = {
+            executor.submit(download_file, url, filepath): name
+            for name, (url, filepath) in pending.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    # Report in DOC_URLS order regardless of completion order
+    return {name: results[name] for name in DOC_URLS}
+
+
+@functools.cache
+def _read_doc(path: str) -> str:
+    """Read a documentation file once and keep its content for later calls."""
+    return Path(path).read_text(encoding="utf-8-sig")
+
+
+def get_doc_content(doc_name: str) -> str | None:
+    """Get the content of one downloaded documentation file.
+
+    Content is cached after the first read; download_docs clears the cache when
+    it rewrites files.
+
+    Args:
+        doc_name: Key of the document in DOC_FILES
+
+    Returns:
+        The file content, or None if the document is unknown or not downloaded
+    """
+    filepath = DOC_FILES.get(doc_name)
+    if filepath is None or not filepath.exists():
+        return None
+    return _read_doc(str(filepath))
+
+
+def iter_docs() -> Iterator[tuple[str, str]]:
+    """Read downloaded documentation files one at a time.
 
-    return results
+    Each file is read only when the next item is requested, so a pipeline that
+    processes documents one by one holds a single file in memory. Reads bypass
+    the get_doc_content cache so streamed files are not pinned in memory.
+
+    Yields:
+        Tuples of (doc name, content) for each downloaded file
+    """
+    for name, filepath in DOC_FILES.items():
+        if filepath.exists():
+            yield name, filepath.read_text(encoding="utf-8-sig")
 
 
 def get_all_docs() -> dict[str, str]:
@@ -66,9 +138,10 @@ def get_all_docs() -> dict[str, str]:
         Dictionary mapping doc names to their content
     """
     docs = {}
-    for name, filepath in DOC_FILES.items():
-        if filepath.exists():
-            docs[name] = filepath.read_text(encoding="utf-8")
+    for name in DOC_FILES:
+        content = get_doc_content(name)
+        if content is not None:
+            docs[name] = content
     return docs
 
 
@@ -3,19 +3,51 @@
 Cleans and filters documentation before chunking to improve retrieval quality.
 """
 
+import functools
 import re
+from collections.abc import Iterator
+from hashlib import blake2b
 
 from loguru import logger
 
 from src.common.constants import (
+    BOILERPLATE_LEAD_PATTERN,
+    BOILERPLATE_REMOVAL_RULES,
+    BROKEN_LINK_RE,
+    CODE_FENCE,
+    DEDUP_DIGEST_SIZE,
     DEDUP_SIGNATURE_LENGTH,
-    EMPTY_CODE_BLOCK_PATTERN,
-    MAX_CONSECUTIVE_BLANK_LINES,
+    EMPTY_CODE_BLOCK_RE,
+    EXCESS_BLANK_LINES_RE,
+    GENERIC_CODE_FENCE_OPEN,
+    IRRELEVANT_SECTION_END_LEVEL,
+    IRRELEVANT_SECTION_MIN_LEVEL,
+    IRRELEVANT_SECTION_TITLE_RE,
+    JS_NOISE_RE,
     MIN_SECTION_LENGTH,
-    NAVIGATION_REMOVAL_PATTERNS,
-    PYTHON_CODE_INDICATORS,
-    WHITESPACE_CODE_BLOCK_PATTERN,
+    NON_WHITESPACE_RE,
+    PREPROCESS_CACHE_DIGEST_SIZE,
+    PREPROCESS_CACHE_VERSION,
+    PYTHON_CODE_INDICATOR_RE,
+    SECTION_HEADER_SPLIT_RE,
+    WHITESPACE_CODE_BLOCK_RE,
 )
+from src.config import PREPROCESS_CACHE_DIR
+
+
+def remove_empty_code_blocks(text: str) -> str:
+    """Remove code blocks that are empty or contain only whitespace.
+
+    Args:
+        text: Documentation text
+
+    Returns:
+        Text without empty code blocks
+    """
+    if CODE_FENCE not in text:
+        return text
+    text = EMPTY_CODE_BLOCK_RE.sub("", text)
+    return WHITESPACE_CODE_BLOCK_RE.sub("", text)
 
 
 def remove_inline_js_noise(text: str) -> str:
@@ -29,15 +61,6 @@ def remove_inline_js_noise(text: str) -> str:
     Returns:
         Text with inline JS noise removed
     """
-    # Remove lines that are clearly inline JS/TS (not in code blocks)
-    js_noise_patterns = [
-        r'^import \{[^}]+\} from ["\']@[^"\']+["\'];?\s*$',  # import { x } from "@langchain/..."
-        r"^const \w+\s*=\s*new \w+\([^)]*\);?\s*$",  # const x = new Something()
-        r"^let \w+\s*[:=]",  # let x = or let x:
-        r"^export (?:const|function|class|interface|type)\s",  # export declarations
-        r"^\s*\w+:\s*(?:string|number|boolean|any)\[?\]?,?\s*$",  # TypeScript type annotations
-    ]
-
     lines = text.split("\n")
     filtered_lines = []
     in_code_block = False
@@ -55,43 +78,26 @@ def remove_inline_js_noise(text: str) -> str:
             continue
 
         # Outside code blocks, filter JS noise
-        is_js_noise = False
-        for pattern in js_noise_patterns:
-            if re.match(pattern, line.strip(), re.IGNORECASE):
-                is_js_noise = True
-                break
-
-        if not is_js_noise:
+        if not JS_NOISE_RE.match(line.strip()):
             filtered_lines.append(line)
 
     return "\n".join(filtered_lines)
 
 
-def normalize_code_blocks(text: str) -> str:
-    """Normalize code block markers for consistency.
-
-    Removes empty code blocks and inline JS/TS noise.
-
-    Args:
-        text: Raw documentation text
+@functools.cache
+def _compile_boilerplate(patterns: tuple[str, ...]) -> re.Pattern:
+    """Fuse the given deletion patterns into one alternation behind the lead lookahead.
 
-    Returns:
-        Text with normalized code blocks
+    Cached per combination, so documents with the same markers share a compiled pattern.
     """
-    # Remove empty code blocks
-    text = re.sub(EMPTY_CODE_BLOCK_PATTERN, "", text)
-
-    # Remove code blocks that are just whitespace
-    text = re.sub(WHITESPACE_CODE_BLOCK_PATTERN, "", text)
+    return re.compile(f"{BOILERPLATE_LEAD_PATTERN}(?:{'|'.join(patterns)})")
 
-    # Remove inline JavaScript/TypeScript noise (keep code block examples)
-    text = remove_inline_js_noise(text)
 
-    return text
+def remove_boilerplate(text: str) -> str:
+    """Remove boilerplate and irrelevant content in a single pass.
 
-
-def remove_navigation_boilerplate(text: str) -> str:
-    """Remove navigation links, breadcrumbs, and boilerplate.
+    Deletes navigation links and breadcrumbs, HTML comments and layout tags, and
+    content that is not useful for retrieval (bare API signatures, link lists).
 
     Args:
         text: Documentation text
@@ -99,10 +105,17 @@ def remove_navigation_boilerplate(text: str) -> str:
     Returns:
         Cleaned text
     """
-    for pattern in NAVIGATION_REMOVAL_PATTERNS:
-        text = re.sub(pattern, "", text, flags=re.MULTILINE | re.IGNORECASE)
-
-    return text
+    # Substring checks are far cheaper than a regex scan that finds nothing, so only
+    # patterns whose markers occur in the document are scanned for
+    lowered = text.lower()
+    patterns = tuple(
+        pattern
+        for pattern, markers in BOILERPLATE_REMOVAL_RULES
+        if any(marker in lowered for marker in markers)
+    )
+    if not patterns:
+        return text
+    return _compile_boilerplate(patterns).sub("", text)
 
 
 def clean_markdown(text: str) -> str:
@@ -114,21 +127,15 @@ def clean_markdown(text: str) -> str:
     Returns:
         Cleaned text
     """
-    # Remove excessive blank lines (more than allowed)
-    text = re.sub(rf"\n{{{MAX_CONSECUTIVE_BLANK_LINES},}}", "\n\n\n", text)
+    # Remove trailing spaces/tabs on lines (including what deletions left behind).
+    # A split/rstrip/join is several times faster than a multiline "[ \t]+$" regex.
+    text = "\n".join([line.rstrip(" \t") for line in text.split("\n")])
 
-    # Remove trailing whitespace on lines
-    text = re.sub(r"[ \t]+$", "", text, flags=re.MULTILINE)
+    # Remove excessive blank lines (more than allowed)
+    text = EXCESS_BLANK_LINES_RE.sub("\n\n\n", text)
 
     # Clean up broken markdown links
-    text = re.sub(r"\[([^\]]+)\]\(\s*\)", r"\1", text)
-
-    # Remove HTML comments
-    text = re.sub(r"<!--.*?-->", "", text, flags=re.DOTALL)
-
-    # Remove inline HTML tags (but keep content)
-    text = re.sub(r"<(?:div|span|p|br|hr)[^>]*/?>", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"</(?:div|span|p)>", "", text, flags=re.IGNORECASE)
+    text = BROKEN_LINK_RE.sub(r"\1", text)
 
     return text
 
@@ -136,81 +143,154 @@ def clean_markdown(text: str) -> str:
 def extract_python_sections(text: str) -> str:
     """Enhance Python code sections with clear markers.
 
+    Generic code blocks that look like Python are tagged with a python fence.
+    The fences are located with str.find, so only block bodies are scanned for
+    Python indicators.
+
     Args:
         text: Documentation text
 
     Returns:
         Text with enhanced Python sections
     """
+    parts = []
+    pos = 0
+    while (start := text.find(GENERIC_CODE_FENCE_OPEN, pos)) != -1:
+        body_start = start + len(GENERIC_CODE_FENCE_OPEN)
+        end = text.find(CODE_FENCE, body_start)
+        if end == -1:
+            break
+        close = end + len(CODE_FENCE)
+
+        if PYTHON_CODE_INDICATOR_RE.search(text, body_start, end):
+            parts.append(text[pos:start])
+            parts.append("```python\n")
+            parts.append(text[body_start:close])
+        else:
+            parts.append(text[pos:close])
+        pos = close
+
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def iter_sections(text: str) -> Iterator[tuple[int, int, str | None]]:
+    """Yield the sections between and including header lines, as offsets.
+
+    Covers the text exactly as SECTION_HEADER_SPLIT_RE.split would, without
+    copying the bodies out of it.
 
-    # Ensure Python code blocks are clearly marked
-    # Convert generic code blocks that look like Python
-    def convert_generic_to_python(match):
-        code = match.group(1)
-        # Check if it looks like Python
-        if any(indicator in code for indicator in PYTHON_CODE_INDICATORS):
-            return f"```python\n{code}```"
-        return match.group(0)
-
-    text = re.sub(r"```\n(.*?)```", convert_generic_to_python, text, flags=re.DOTALL)
+    Args:
+        text: Documentation text
 
-    return text
+    Yields:
+        (start, end, header) for each piece in order; header is the header line
+        for header pieces and None for the bodies between them
+    """
+    pos = 0
+    for match in SECTION_HEADER_SPLIT_RE.finditer(text):
+        yield pos, match.start(), None
+        yield match.start(), match.end(), match.group(1)
+        pos = match.end()
+    yield pos, len(text), None
 
 
-def remove_duplicate_sections(text: str) -> str:
-    """Remove duplicate content sections.
+def _stripped_head(text: str, start: int, end: int) -> str:
+    """Return text[start:end].strip()[:DEDUP_SIGNATURE_LENGTH] without copying the section.
 
     Args:
         text: Documentation text
+        start: Start offset of the section
+        end: End offset of the section
 
     Returns:
-        Text with duplicates removed
+        The first DEDUP_SIGNATURE_LENGTH characters of the stripped section
     """
-    # Split into sections by headers
-    sections = re.split(r"(^#{1,4}\s+.+$)", text, flags=re.MULTILINE)
-
-    seen_content = set()
-    unique_sections = []
-
-    for section in sections:
-        # Skip very short sections
-        if len(section.strip()) < MIN_SECTION_LENGTH:
-            unique_sections.append(section)
-            continue
+    first = NON_WHITESPACE_RE.search(text, start, end)
+    if first is None:
+        return ""
 
-        signature = section.strip()[:DEDUP_SIGNATURE_LENGTH].lower()
-        if signature not in seen_content:
-            seen_content.add(signature)
-            unique_sections.append(section)
+    head_start = first.start()
+    head = text[head_start : min(end, head_start + DEDUP_SIGNATURE_LENGTH)]
+    trimmed = head.rstrip()
+    # Whitespace at the end of the head is trailing only if nothing follows it
+    if len(trimmed) < len(head) and not NON_WHITESPACE_RE.search(
+        text, head_start + len(trimmed), end
+    ):
+        return trimmed
+    return head
 
-    return "".join(unique_sections)
 
+def filter_sections(text: str) -> str:
+    """Remove irrelevant and duplicate sections in one pass over the headers.
 
-def filter_relevant_content(text: str) -> str:
-    """Filter out irrelevant content sections.
+    Changelogs and non-Python install instructions are found by their header
+    titles: a section opened by such an H2-H4 header is dropped up to the next
+    H1-H3 header. Of the remaining pieces, those whose opening characters repeat
+    an earlier piece are dropped as duplicates.
 
     Args:
         text: Documentation text
 
     Returns:
-        Filtered text
+        Text without irrelevant or duplicate sections
     """
-    # Remove sections that are clearly not useful
-    remove_patterns = [
-        # API reference with just type signatures (no examples)
-        r"#{2,4}\s+(?:Parameters|Returns|Raises|Attributes)\s*\n(?:\s*[-*]\s+\*\*\w+\*\*.*\n)+",
-        # Long lists of just links
-        r"(?:^\s*[-*]\s+\[[\w\s]+\]\([^)]+\)\s*$\n){5,}",
-        # Version/changelog sections
-        r"#{2,4}\s+(?:Changelog|Version History|Release Notes).*?(?=^#{1,3}\s|\Z)",
-        # Installation for other languages
-        r"#{2,4}\s+(?:npm|yarn|pnpm)\s+install.*?(?=^#{1,3}\s|\Z)",
-    ]
-
-    for pattern in remove_patterns:
-        text = re.sub(pattern, "", text, flags=re.MULTILINE | re.DOTALL | re.IGNORECASE)
+    # 64-bit fingerprints of the signatures instead of the signature strings
+    seen_content: set[int] = set()
+    # Kept runs are sliced from the original text only around dropped sections
+    kept_parts = []
+    keep_from = 0
+    drop_from = None
+
+    for start, end, header in iter_sections(text):
+        if header is not None:
+            title = header.lstrip("#")
+            level = len(header) - len(title)
+
+            if drop_from is not None and level <= IRRELEVANT_SECTION_END_LEVEL:
+                kept_parts.append(text[keep_from:drop_from])
+                keep_from = start
+                drop_from = None
+
+            if (
+                drop_from is None
+                and level >= IRRELEVANT_SECTION_MIN_LEVEL
+                and IRRELEVANT_SECTION_TITLE_RE.match(title.lstrip())
+            ):
+                drop_from = start
+
+        # Dropped sections neither count as seen nor need checking
+        if drop_from is not None:
+            continue
 
-    return text
+        # Skip very short sections (a short span cannot strip to a long one)
+        if end - start < MIN_SECTION_LENGTH:
+            continue
+        # The head is shorter than the signature length only if it is the whole
+        # stripped section, so it also answers the minimum-length check
+        head = _stripped_head(text, start, end)
+        if len(head) < MIN_SECTION_LENGTH:
+            continue
+
+        signature = int.from_bytes(
+            blake2b(head.lower().encode(), digest_size=DEDUP_DIGEST_SIZE).digest()
+        )
+        if signature in seen_content:
+            kept_parts.append(text[keep_from:start])
+            keep_from = end
+        else:
+            seen_content.add(signature)
+
+    if drop_from is not None:
+        kept_parts.append(text[keep_from:drop_from])
+        keep_from = len(text)
+
+    if not kept_parts:
+        return text
+    kept_parts.append(text[keep_from:])
+    return "".join(kept_parts)
 
 
 def preprocess_document(text: str, source: str) -> str:
@@ -225,14 +305,17 @@ def preprocess_document(text: str, source: str) -> str:
     """
     original_len = len(text)
 
-    # Step 1: Normalize code blocks (remove inline JS/TS noise, keep examples)
-    text = normalize_code_blocks(text)
+    # Step 1: Remove empty code blocks, then inline JS/TS noise outside code blocks
+    # (keep examples). Empty blocks go first: a fence opening and closing on one
+    # line would otherwise invert the JS filter's code block tracking.
+    text = remove_empty_code_blocks(text)
+    text = remove_inline_js_noise(text)
     logger.debug(
-        f"After code normalization: {len(text)} chars ({len(text) / original_len * 100:.1f}%)"
+        f"After JS noise removal: {len(text)} chars ({len(text) / original_len * 100:.1f}%)"
     )
 
-    # Step 2: Remove navigation and boilerplate
-    text = remove_navigation_boilerplate(text)
+    # Step 2: Remove boilerplate and navigation in one pass
+    text = remove_boilerplate(text)
 
     # Step 3: Clean markdown formatting
     text = clean_markdown(text)
@@ -240,11 +323,10 @@ def preprocess_document(text: str, source: str) -> str:
     # Step 4: Enhance Python sections
     text = extract_python_sections(text)
 
-    # Step 5: Filter irrelevant content
-    text = filter_relevant_content(text)
-
-    # Step 6: Remove duplicates
-    text = remove_duplicate_sections(text)
+    # Step 5: Drop irrelevant and duplicate sections. This runs on the cleaned
+    # text, so sections differing only in whitespace or boilerplate count as
+    # duplicates.
+    text = filter_sections(text)
 
     final_len = len(text)
     reduction = (1 - final_len / original_len) * 100
@@ -255,38 +337,53 @@ def preprocess_document(text: str, source: str) -> str:
     return text.strip()
 
 
-def preprocess_all_docs(docs: dict[str, str]) -> dict[str, str]:
-    """Preprocess all documents.
+def preprocess_document_cached(text: str, source: str) -> str:
+    """Preprocess a document, reusing the stored result for unchanged input.
+
+    The pipeline is a pure function of the text, so results are stored on disk
+    under a digest of the raw content and PREPROCESS_CACHE_VERSION. Re-running
+    ingest on byte-identical files costs one hash and one file read.
 
     Args:
-        docs: Dictionary mapping source names to document content
+        text: Raw documentation text
+        source: Source identifier
 
     Returns:
-        Dictionary with preprocessed content
+        Preprocessed text ready for chunking
     """
-    preprocessed = {}
+    digest = blake2b(text.encode(), digest_size=PREPROCESS_CACHE_DIGEST_SIZE).hexdigest()
+    cache_file = PREPROCESS_CACHE_DIR / f"{source}-v{PREPROCESS_CACHE_VERSION}-{digest}.txt"
 
-    for source, content in docs.items():
-        logger.info(f"Preprocessing {source}...")
-        preprocessed[source] = preprocess_document(content, source)
+    if cache_file.exists():
+        logger.info(f"Using cached preprocessing for {source}")
+        return cache_file.read_text(encoding="utf-8")
 
-    return preprocessed
+    processed = preprocess_document(text, source)
+
+    # Only the latest result per source is worth keeping
+    PREPROCESS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in PREPROCESS_CACHE_DIR.glob(f"{source}-v*.txt"):
+        stale.unlink(missing_ok=True)
+    cache_file.write_text(processed, encoding="utf-8")
+
+    return processed
 
 
 if __name__ == "__main__":
-    from src.data_prep.downloader import get_all_docs
+    from src.data_prep.downloader import iter_docs
 
-    docs = get_all_docs()
-    if docs:
-        preprocessed = preprocess_all_docs(docs)
+    found = False
+    for source, content in iter_docs():
+        found = True
+        logger.info(f"Preprocessing {source}...")
+        content = preprocess_document_cached(content, source)
 
         # Show sample
-        for source, content in preprocessed.items():
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"Source: {source}")
-            logger.info(f"Length: {len(content):,} chars")
-            logger.info(f"{'=' * 60}")
-            logger.info(content[:1000])
-            logger.info("...")
-    else:
+        logger.info(f"\n{'=' * 60}")
+        logger.info(f"Source: {source}")
+        logger.info(f"Length: {len(content):,} chars")
+        logger.info(f"{'=' * 60}")
+        logger.info(content[:1000])
+        logger.info("...")
+    if not found:
         logger.warning("No docs found. Run downloader first.")
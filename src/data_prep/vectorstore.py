@@ -1,19 +1,39 @@
 """FAISS vector store management."""
 
+import functools
+import json
+from collections import deque
+from collections.abc import Iterable, Iterator, Sized
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from itertools import chain, islice
 from pathlib import Path
 
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
-from langchain_core.documents import Document
 from langchain_ollama import OllamaEmbeddings
 from loguru import logger
 
-from src.common.constants import VECTORSTORE_BATCH_SIZE
+from src.common.constants import (
+    EMBEDDING_CACHE_DIGEST_SIZE,
+    EMBEDDING_CONCURRENCY,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    HNSW_M,
+    VECTORSTORE_BATCH_SIZE,
+)
 from src.common.llm_constants import EMBEDDING_MODEL
-from src.config import VECTORSTORE_DIR
+from src.common.types import Chunk
+from src.config import EMBEDDING_CACHE_DIR, VECTORSTORE_DIR
 
 
+@functools.lru_cache(maxsize=1)
 def get_embeddings() -> OllamaEmbeddings:
-    """Get the Ollama embedding model.
+    """Get the shared Ollama embedding model.
+
+    Built once per process, so later loads and builds reuse its HTTP connection pool.
 
     Returns:
         Configured Ollama embedding model
@@ -21,51 +41,182 @@ def get_embeddings() -> OllamaEmbeddings:
     return OllamaEmbeddings(model=EMBEDDING_MODEL)
 
 
+def _chunk_digest(text: str) -> str:
+    """Digest of a chunk's text, used as its embedding cache key."""
+    return blake2b(text.encode(), digest_size=EMBEDDING_CACHE_DIGEST_SIZE).hexdigest()
+
+
+def _load_embedding_cache(cache_dir: Path) -> dict[str, np.ndarray]:
+    """Load the vectors embedded by the previous build.
+
+    Args:
+        cache_dir: Directory holding manifest.json and vectors.npy
+
+    Returns:
+        Mapping of chunk digest to vector; empty if there is no cache or it was
+        built with a different embedding model
+    """
+    manifest_file = cache_dir / "manifest.json"
+    vectors_file = cache_dir / "vectors.npy"
+    if not (manifest_file.exists() and vectors_file.exists()):
+        return {}
+
+    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    if manifest.get("model") != EMBEDDING_MODEL:
+        logger.info("Embedding model changed, ignoring cached vectors")
+        return {}
+
+    vectors = np.load(vectors_file)
+    return dict(zip(manifest["digests"], vectors, strict=True))
+
+
+def _save_embedding_cache(cache_dir: Path, cache: dict[str, np.ndarray]):
+    """Store the vectors of the current build for the next one.
+
+    Args:
+        cache_dir: Directory to write manifest.json and vectors.npy into
+        cache: Mapping of chunk digest to vector
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    np.save(cache_dir / "vectors.npy", np.array(list(cache.values()), dtype=np.float32))
+    manifest = {"model": EMBEDDING_MODEL, "digests": list(cache)}
+    (cache_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def _create_index(dimension: int) -> faiss.Index:
+    """Create an HNSW graph index for approximate nearest-neighbor search.
+
+    Queries walk the graph instead of scanning every vector as a flat index
+    does, so search cost grows roughly logarithmically with the corpus. Vectors
+    are stored as FP16, halving index memory and the bandwidth each distance
+    computation reads; unlike int8 codes this needs no training pass, so batches
+    can still be added as they are embedded.
+
+    Args:
+        dimension: Embedding vector size
+
+    Returns:
+        Empty FAISS index using L2 distance
+    """
+    index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_fp16, HNSW_M)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    return index
+
+
+def _batched(items: Iterable[Chunk], batch_size: int) -> Iterator[list[Chunk]]:
+    """Group an iterable into lists of at most batch_size items."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
 def create_vectorstore(
-    documents: list[Document],
+    chunks: Iterable[Chunk],
     save_path: Path | None = None,
     batch_size: int = VECTORSTORE_BATCH_SIZE,
+    concurrency: int = EMBEDDING_CONCURRENCY,
+    cache_dir: Path | None = EMBEDDING_CACHE_DIR,
 ) -> FAISS:
-    """Create a FAISS vector store from documents with progress logging.
+    """Create a FAISS vector store from chunks with progress logging.
+
+    Chunks are consumed batch by batch, so a generator of chunks is embedded
+    as it is produced instead of being collected first. Several batches are
+    embedded concurrently so the Ollama server is never idle while the next
+    request is prepared; their vectors are added to the index in input order.
+
+    Vectors are cached on disk by chunk digest, so a rebuild only sends chunks
+    whose text changed since the previous build to the embedding model.
 
     Args:
-        documents: List of Document objects to index
+        chunks: (text, metadata) tuples to index (a list or any iterable)
         save_path: Optional path to save the vector store
         batch_size: Number of documents to process per batch
+        concurrency: Maximum number of batches being embedded at once
+        cache_dir: Directory of the embedding cache, or None to embed everything
 
     Returns:
         FAISS vector store
     """
-    if not documents:
+    # Totals are only known up front for sized inputs; streams report running counts
+    total_docs = len(chunks) if isinstance(chunks, Sized) else None
+    total_batches = -(-total_docs // batch_size) if total_docs else "?"
+
+    batches = _batched(chunks, batch_size)
+    first_batch = next(batches, None)
+    if not first_batch:
         raise ValueError("No documents provided to create vector store")
 
-    total_docs = len(documents)
-    logger.info(f"Creating vector store with {total_docs} documents (batch size: {batch_size})...")
+    logger.info(f"Creating vector store (batch size: {batch_size})...")
     embeddings = get_embeddings()
 
-    # Process first batch to initialize vectorstore
-    first_batch = documents[:batch_size]
-    logger.info(
-        f"Processing batch 1/{(total_docs + batch_size - 1) // batch_size} (documents 1-{len(first_batch)})..."
-    )
-    vectorstore = FAISS.from_documents(first_batch, embeddings)
-    logger.info(
-        f"Progress: {len(first_batch)}/{total_docs} documents embedded ({len(first_batch) * 100 // total_docs}%)"
-    )
-
-    # Process remaining batches
-    for i in range(batch_size, total_docs, batch_size):
-        batch = documents[i : i + batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (total_docs + batch_size - 1) // batch_size
-        logger.info(
-            f"Processing batch {batch_num}/{total_batches} (documents {i + 1}-{i + len(batch)})..."
-        )
-        vectorstore.add_documents(batch)
-        processed = i + len(batch)
-        logger.info(
-            f"Progress: {processed}/{total_docs} documents embedded ({processed * 100 // total_docs}%)"
-        )
+    cached = _load_embedding_cache(cache_dir) if cache_dir else {}
+    # Vectors of this build, written back as the next build's cache
+    current: dict[str, np.ndarray] = {}
+
+    def embed_batch(texts: list[str], digests: list[str]) -> list:
+        """Embed the texts that have no cached vector and merge in the cached ones."""
+        missing = [
+            text for text, digest in zip(texts, digests, strict=True) if digest not in cached
+        ]
+        embedded = iter(embeddings.embed_documents(missing) if missing else ())
+        return [cached[digest] if digest in cached else next(embedded) for digest in digests]
+
+    vectorstore = None
+    processed = 0
+    reused = 0
+
+    def add_oldest_batch():
+        """Wait for the oldest in-flight batch and add its vectors to the index."""
+        nonlocal vectorstore, processed, reused
+        texts, metadatas, digests, future = in_flight.popleft()
+        vectors = future.result()
+
+        # The first batch fixes the dimension of the index; every batch is appended
+        if vectorstore is None:
+            vectorstore = FAISS(
+                embedding_function=embeddings,
+                index=_create_index(len(vectors[0])),
+                docstore=InMemoryDocstore(),
+                index_to_docstore_id={},
+            )
+        vectorstore.add_embeddings(zip(texts, vectors, strict=True), metadatas=metadatas)
+
+        current.update(zip(digests, vectors, strict=True))
+        reused += sum(digest in cached for digest in digests)
+        processed += len(texts)
+        if total_docs:
+            logger.info(
+                f"Progress: {processed}/{total_docs} documents embedded ({processed * 100 // total_docs}%)"
+            )
+        else:
+            logger.info(f"Progress: {processed} documents embedded")
+
+    submitted = 0
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch_num, batch in enumerate(chain([first_batch], batches), start=1):
+            logger.info(
+                f"Processing batch {batch_num}/{total_batches} "
+                f"(documents {submitted + 1}-{submitted + len(batch)})..."
+            )
+            texts, metadatas = map(list, zip(*batch, strict=True))
+            digests = [_chunk_digest(text) for text in texts]
+            future = executor.submit(embed_batch, texts, digests)
+            in_flight.append((texts, metadatas, digests, future))
+            submitted += len(batch)
+
+            # Bound the batches held in memory to those being embedded
+            if len(in_flight) >= concurrency:
+                add_oldest_batch()
+
+        while in_flight:
+            add_oldest_batch()
+
+    if cache_dir:
+        _save_embedding_cache(cache_dir, current)
+    if reused:
+        logger.info(f"Reused cached vectors for {reused}/{processed} documents")
 
     logger.info("Embedding complete!")
 
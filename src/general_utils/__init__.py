@@ -1,8 +1,13 @@
 """General utilities for configuration and common operations."""
 
-from src.general_utils.config_loader import load_yaml_config, validate_config
+from src.general_utils.config_loader import (
+    load_yaml_config,
+    render_json_config,
+    validate_config,
+)
 
 __all__ = [
     "load_yaml_config",
+    "render_json_config",
     "validate_config",
 ]
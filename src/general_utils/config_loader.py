@@ -1,37 +1,156 @@
 """Configuration loading utilities."""
 
+import functools
+import hashlib
+import json
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
-import yaml
+from loguru import logger
 from pydantic import BaseModel, ValidationError
 
+# Key in a JSON rendering holding the SHA-256 hex digest of the YAML it was made from
+_SOURCE_DIGEST_KEY = "source_sha256"
 
-def load_yaml_config(config_path: str) -> dict[str, Any]:
+
+def _parse_yaml(f) -> Any:
+    """Parse a YAML stream (or bytes) with the fastest available safe loader.
+
+    PyYAML is imported here rather than at module level, so a config served
+    from its JSON rendering never pays for the import.
+    """
+    import yaml
+
+    # Prefer the libyaml C parser; PyYAML builds without libyaml only have the pure-Python one
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(f, Loader=loader)
+
+
+def _freeze(value: Any) -> Any:
+    """Make parsed config data read-only all the way down.
+
+    Mappings become read-only views and lists become tuples, so a cached config
+    shared between callers cannot be changed through any nested value.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config_file(path: Path, digest: str, json_digest: str | None) -> Mapping[str, Any]:
+    """Parse a config file; cached per content digest, so edits are picked up.
+
+    A JSON rendering next to a YAML file (e.g. ``config.json`` for
+    ``config.yaml``) is read instead when the YAML digest stored in it matches,
+    as JSON parses much faster than YAML.
+
+    Args:
+        path: Path to the YAML or JSON config file
+        digest: SHA-256 hex digest of the file's contents, part of the cache key
+        json_digest: SHA-256 hex digest of the JSON rendering, or None if there is
+            none; part of the cache key, so a rendering written later is picked up
+
+    Returns:
+        Read-only view of the parsed configuration
+
+    Raises:
+        ValueError: If the file is empty
+    """
+    config = None
+    if json_digest is not None:
+        json_path = path.with_suffix(".json")
+        with open(json_path, "rb") as f:
+            rendering = json.load(f)
+        if isinstance(rendering, dict) and rendering.get(_SOURCE_DIGEST_KEY) == digest:
+            logger.info(f"Loading configuration from {json_path}, rendered from {path.name}")
+            config = rendering.get("config")
+        else:
+            logger.warning(
+                f"Ignoring {json_path}: it was not rendered from the current {path.name}"
+            )
+
+    if config is None:
+        with open(path, "rb") as f:
+            config = json.load(f) if path.suffix == ".json" else _parse_yaml(f)
+
+    if config is None:
+        raise ValueError(f"Configuration file is empty: {path}")
+
+    return _freeze(config)
+
+
+def _read_config_bytes(config_path: str) -> tuple[Path, bytes]:
+    """Resolve a config path and read its contents.
+
+    Raises:
+        FileNotFoundError: If the config file doesn't exist
+    """
+    path = Path(config_path).resolve()
+    try:
+        return path, path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+
+
+def load_yaml_config(config_path: str) -> Mapping[str, Any]:
     """Load configuration from a YAML file.
 
+    The parsed result is shared between callers until the file or its JSON
+    rendering changes, so it is returned as a read-only mapping, nested values
+    included.
+
     Args:
         config_path: Path to the YAML configuration file
 
     Returns:
-        Dictionary containing the configuration
+        Read-only mapping containing the configuration
 
     Raises:
         FileNotFoundError: If the config file doesn't exist
         ValueError: If the config file is empty or invalid
     """
-    path = Path(config_path)
+    path, content = _read_config_bytes(config_path)
 
-    if not path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    json_path = path.with_suffix(".json")
+    json_digest = None
+    if json_path != path:
+        try:
+            json_digest = hashlib.sha256(json_path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            pass
 
-    with open(path) as f:
-        config = yaml.safe_load(f)
+    return _load_config_file(path, hashlib.sha256(content).hexdigest(), json_digest)
 
-    if config is None:
-        raise ValueError(f"Configuration file is empty: {config_path}")
 
-    return config
+def render_json_config(config_path: str) -> Path:
+    """Write the JSON rendering of a YAML config file next to it.
+
+    The rendering stores the YAML's digest with the parsed config, so
+    load_yaml_config uses it only while the YAML is unchanged.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Path of the written JSON file
+
+    Raises:
+        FileNotFoundError: If the config file doesn't exist
+    """
+    path, content = _read_config_bytes(config_path)
+    rendering = {
+        _SOURCE_DIGEST_KEY: hashlib.sha256(content).hexdigest(),
+        "config": _parse_yaml(content),
+    }
+
+    json_path = path.with_suffix(".json")
+    json_path.write_text(json.dumps(rendering), encoding="utf-8")
+    return json_path
 
 
 def validate_config(config_dict: dict[str, Any], schema_class: type[BaseModel]) -> Any:
@@ -1,13 +1,17 @@
 """StateGraph definition for the LangGraph Helper Agent."""
 
+import functools
+from collections.abc import Iterator
+
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from loguru import logger
 
-from src.common.constants import MAX_CHAT_HISTORY, MAX_QUERY_LENGTH, SUSPICIOUS_PATTERNS
+from src.common.constants import MAX_CHAT_HISTORY, MAX_QUERY_LENGTH, SUSPICIOUS_PATTERN_RE
+from src.common.types import ChatMessage
 from src.nodes.answer_generator import answer_generator
 from src.nodes.query_classifier import query_classifier
-from src.nodes.retriever import retriever
+from src.nodes.retriever import base_retriever, context_builder, retriever
 from src.nodes.web_search import web_search
 from src.state import AgentState
 
@@ -25,29 +29,27 @@ def sanitize_query(query: str) -> str:
         This provides basic protection against common prompt injection patterns.
         It logs warnings but does not block queries to avoid false positives.
     """
-    query_lower = query.lower()
-
-    for pattern in SUSPICIOUS_PATTERNS:
-        if pattern in query_lower:
-            logger.warning(f"Suspicious pattern detected in query: '{pattern}'")
-            # We log but don't block - users asking about prompt injection are valid
-            break
+    match = SUSPICIOUS_PATTERN_RE.search(query.lower())
+    if match:
+        logger.warning(f"Suspicious pattern detected in query: '{match.group(0)}'")
+        # We log but don't block - users asking about prompt injection are valid
 
     return query
 
 
-def route_by_mode(state: AgentState) -> str:
+def route_by_mode(state: AgentState) -> list[str]:
     """Route based on agent mode.
 
     Args:
         state: Current agent state
 
     Returns:
-        Next node name: "web_search" for online mode, "retriever" for offline
+        Next node names: web_search and retriever (run concurrently) for online
+        mode, retriever alone for offline
     """
     if state["mode"] == "online":
-        return "web_search"
-    return "retriever"
+        return ["web_search", "retriever"]
+    return ["retriever"]
 
 
 def build_graph() -> CompiledStateGraph:
@@ -61,24 +63,32 @@ def build_graph() -> CompiledStateGraph:
 
     # Add nodes
     graph.add_node("query_classifier", query_classifier)
+    graph.add_node("base_retriever", base_retriever)
     graph.add_node("retriever", retriever)
     graph.add_node("web_search", web_search)
+    graph.add_node("context_builder", context_builder)
     graph.add_node("answer_generator", answer_generator)
 
     # Add edges
-    # Entry point to query classifier
+    # Entry point to query classifier, with the classification-independent searches
+    # running in the same step (LangGraph runs both nodes concurrently)
     graph.add_edge(START, "query_classifier")
+    graph.add_edge(START, "base_retriever")
 
     # After classification, route based on mode
     graph.add_conditional_edges(
         "query_classifier", route_by_mode, {"web_search": "web_search", "retriever": "retriever"}
     )
+    # retriever extends base_retriever's results, so it also waits for that node
+    graph.add_edge(["query_classifier", "base_retriever"], "retriever")
 
-    # After web search, go to retriever (hybrid approach)
-    graph.add_edge("web_search", "retriever")
+    # Join web search and retrieval into one context (hybrid approach). Both run in
+    # the same step, so context_builder runs once, after both have finished.
+    graph.add_edge("web_search", "context_builder")
+    graph.add_edge("retriever", "context_builder")
 
-    # After retrieval, generate answer
-    graph.add_edge("retriever", "answer_generator")
+    # With the context built, generate answer
+    graph.add_edge("context_builder", "answer_generator")
 
     # After answer generation, end
     graph.add_edge("answer_generator", END)
@@ -87,24 +97,23 @@ def build_graph() -> CompiledStateGraph:
     return graph.compile()
 
 
-# Create a singleton instance of the compiled graph
-_graph = None
-
-
+@functools.cache
 def get_graph() -> CompiledStateGraph:
-    """Get the compiled graph, building it if necessary.
+    """Get the compiled graph, compiling it on first use.
+
+    Cached, so each process compiles the graph once and every later request
+    reuses it; importing this module does not compile it.
 
     Returns:
         Compiled StateGraph instance
     """
-    global _graph
-    if _graph is None:
-        _graph = build_graph()
-    return _graph
+    return build_graph()
 
 
-def run_agent(query: str, mode: str = "offline", chat_history: list[dict] | None = None) -> str:
-    """Run the agent with a query.
+def _build_initial_state(
+    query: str, mode: str, chat_history: list[ChatMessage] | None
+) -> AgentState:
+    """Validate the inputs and build the graph's initial state.
 
     Args:
         query: The user's question
@@ -112,7 +121,7 @@ def run_agent(query: str, mode: str = "offline", chat_history: list[dict] | None
         chat_history: Optional list of previous messages
 
     Returns:
-        The agent's response
+        Initial agent state
 
     Raises:
         ValueError: If query is empty, too long, or mode is invalid
@@ -136,18 +145,93 @@ def run_agent(query: str, mode: str = "offline", chat_history: list[dict] | None
     if len(history) > MAX_CHAT_HISTORY:
         history = history[-MAX_CHAT_HISTORY:]
 
-    graph = get_graph()
-
-    initial_state = {
+    return {
         "query": query,
         "query_type": None,
         "mode": mode,
+        "base_docs": None,
         "retrieved_docs": None,
         "web_results": None,
         "context": None,
         "response": None,
+        "error": None,
         "chat_history": history,
     }
 
-    result = graph.invoke(initial_state)
+
+def run_agent(
+    query: str, mode: str = "offline", chat_history: list[ChatMessage] | None = None
+) -> str:
+    """Run the agent with a query.
+
+    Args:
+        query: The user's question
+        mode: "offline" or "online"
+        chat_history: Optional list of previous messages
+
+    Returns:
+        The agent's response
+
+    Raises:
+        ValueError: If query is empty, too long, or mode is invalid
+    """
+    result = get_graph().invoke(_build_initial_state(query, mode, chat_history))
     return result["response"]
+
+
+def run_agent_stream(
+    query: str, mode: str = "offline", chat_history: list[ChatMessage] | None = None
+) -> Iterator[str]:
+    """Run the agent with a query, yielding the answer as it is generated.
+
+    Tokens of the answer_generator's LLM call are forwarded as they arrive, so
+    the caller can show the first words without waiting for the full answer.
+    Inputs are validated before this returns, not on the first iteration.
+
+    Args:
+        query: The user's question
+        mode: "offline" or "online"
+        chat_history: Optional list of previous messages
+
+    Returns:
+        Iterator over pieces of the agent's response, in order
+
+    Raises:
+        ValueError: If query is empty, too long, or mode is invalid
+    """
+    return _stream_response(_build_initial_state(query, mode, chat_history))
+
+
+def _stream_response(initial_state: AgentState) -> Iterator[str]:
+    """Run the graph and yield the answer_generator's tokens as they arrive.
+
+    Args:
+        initial_state: Validated initial agent state
+
+    Yields:
+        Pieces of the agent's response, in order
+    """
+    streamed = False
+    final_state = None
+    for stream_mode, payload in get_graph().stream(
+        initial_state, stream_mode=["messages", "values"]
+    ):
+        if stream_mode == "values":
+            final_state = payload
+            continue
+
+        chunk, metadata = payload
+        if metadata.get("langgraph_node") == "answer_generator" and chunk.content:
+            streamed = True
+            yield chunk.content
+
+    if not final_state:
+        return
+
+    # Errors come back as a plain response. Before any token they are the whole
+    # answer; after some, they follow the partial answer so the failure is visible.
+    if not streamed:
+        if final_state.get("response"):
+            yield final_state["response"]
+    elif final_state.get("error"):
+        yield f"\n\n{final_state['error']}"
@@ -1,6 +1,6 @@
 """Unified LLM client for OpenRouter and Ollama providers."""
 
-from src.llm_client.client import UnifiedLLMClient
+from src.llm_client.client import UnifiedLLMClient, get_llm_client
 from src.llm_client.schemas import (
     LLMConfig,
     LLMParameters,
@@ -17,6 +17,7 @@ from src.llm_client.utils import (
 
 __all__ = [
     "UnifiedLLMClient",
+    "get_llm_client",
     "LLMConfig",
     "LLMParameters",
     "ModelConfig",
@@ -1,13 +1,25 @@
 """Unified client for OpenRouter and Ollama LLM providers."""
 
+import asyncio
+import functools
+import itertools
+import threading
 from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from hashlib import blake2b
 
 import httpx
-import requests
-from langchain.chat_models import init_chat_model
+from langchain_core.messages import BaseMessage, BaseMessageChunk, SystemMessage
 from loguru import logger
 
-from src.common.llm_constants import OPENROUTER_BASE_URL
+from src.common.llm_constants import (
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_BATCH_BIN_WIDTH,
+    OPENROUTER_BASE_URL,
+)
 from src.general_utils.config_loader import load_yaml_config, validate_config
 from src.llm_client.schemas import LLMConfig, OllamaSettings, OpenRouterSettings
 from src.llm_client.utils import (
@@ -15,6 +27,54 @@ from src.llm_client.utils import (
     load_env_var,
 )
 
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+)
+
+
+@functools.cache
+def _shared_http_client(timeout: float) -> httpx.Client:
+    """Get the process-wide sync HTTP client for OpenAI-compatible providers.
+
+    Every chat model built on it reuses one keep-alive connection pool, so
+    requests skip the TCP and TLS handshakes after the first. Only the sync
+    client is shared: an ``httpx.AsyncClient`` is bound to the event loop it
+    first runs on, so async calls keep the provider's per-model client.
+
+    Args:
+        timeout: Request timeout in seconds
+
+    Returns:
+        Shared sync HTTP client
+    """
+    return httpx.Client(limits=_HTTP_LIMITS, timeout=timeout)
+
+
+@contextmanager
+def _provider_errors(action: str, activity: str) -> Iterator[None]:
+    """Log transport and input errors from an LLM call and raise them as ProviderError.
+
+    Args:
+        action: Verb for the error message, e.g. "invoke"
+        activity: Present participle for the log message, e.g. "invoking"
+
+    Raises:
+        ProviderError: If the wrapped call fails with an HTTP, connection or input error
+    """
+    try:
+        yield
+    except httpx.HTTPError as e:
+        logger.error(f"HTTP error {activity} LLM: {e}")
+        raise ProviderError(f"Failed to {action} LLM: {e}") from e
+    except (TimeoutError, ConnectionError) as e:
+        logger.error(f"Connection error {activity} LLM: {e}")
+        raise ProviderError(f"Failed to {action} LLM: {e}") from e
+    except ValueError as e:
+        logger.error(f"Invalid input to LLM: {e}")
+        raise ProviderError(f"Failed to {action} LLM: {e}") from e
+
 
 class UnifiedLLMClient:
     """Unified client for OpenRouter and Ollama LLM providers."""
@@ -29,6 +89,10 @@ class UnifiedLLMClient:
         self.config: LLMConfig = validate_config(config_dict.get("llm", {}), LLMConfig)
         self.llm = self._initialize_llm()
 
+        # In-flight invoke calls by prompt key, shared by concurrent identical requests
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
     def _initialize_llm(self):
         """Initialize the appropriate LLM based on configuration."""
         platform = self.config.platform
@@ -42,6 +106,9 @@ class UnifiedLLMClient:
 
     def _init_openrouter(self):
         """Initialize OpenRouter LLM."""
+        # Imported here, as LangChain's model factory is only needed to build a client
+        from langchain.chat_models import init_chat_model
+
         api_key = load_env_var("OPENROUTER_API_KEY", required=True)
 
         settings = self.config.openrouter or OpenRouterSettings()
@@ -57,10 +124,13 @@ class UnifiedLLMClient:
             max_tokens=self.config.parameters.max_tokens,
             timeout=settings.timeout,
             max_retries=settings.max_retries,
+            http_client=_shared_http_client(settings.timeout),
         )
 
     def _init_ollama(self):
         """Initialize Ollama LLM."""
+        from langchain.chat_models import init_chat_model
+
         settings = self.config.ollama or OllamaSettings()
 
         logger.info(f"Initializing Ollama with model: {self.config.model.name}")
@@ -71,13 +141,44 @@ class UnifiedLLMClient:
             base_url=settings.base_url,
             temperature=self.config.parameters.temperature,
             num_predict=self.config.parameters.max_tokens,
+            # Forwarded to the httpx client the Ollama SDK creates
+            client_kwargs={"limits": _HTTP_LIMITS},
+        )
+
+    def system_message(self, text: str) -> SystemMessage:
+        """Build a system message, marked cacheable where the provider supports it.
+
+        OpenRouter forwards ``cache_control`` breakpoints to Anthropic and Gemini
+        models, so a static system prompt is billed at the cached-read rate after
+        the first turn; OpenAI-compatible models cache the leading prefix on their
+        own. Ollama has no prompt caching and gets a plain message.
+
+        Args:
+            text: Static system prompt text
+
+        Returns:
+            System message to place first in the conversation
+        """
+        if self.config.platform != "openrouter":
+            return SystemMessage(content=text)
+
+        return SystemMessage(
+            content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
         )
 
-    def invoke(self, prompt: str) -> str:
+    def _prompt_key(self, prompt: str | list[BaseMessage]) -> str:
+        """Key identifying a request: the model plus a digest of the prompt."""
+        digest = blake2b(repr(prompt).encode(), digest_size=16).hexdigest()
+        return f"{self.config.model.name}:{digest}"
+
+    def invoke(self, prompt: str | list[BaseMessage]) -> str:
         """Send a prompt and get a response.
 
+        Concurrent calls with an identical prompt are coalesced: the first caller
+        makes the request and the others wait for and share its result (or error).
+
         Args:
-            prompt: The input prompt
+            prompt: The input prompt, or a list of chat messages
 
         Returns:
             The model's response as a string
@@ -85,24 +186,108 @@ class UnifiedLLMClient:
         Raises:
             ProviderError: If the LLM request fails
         """
+        key = self._prompt_key(prompt)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+
+        if not is_leader:
+            return future.result()
+
         try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except (requests.RequestException, httpx.HTTPError) as e:
-            logger.error(f"HTTP error invoking LLM: {e}")
-            raise ProviderError(f"Failed to invoke LLM: {e}") from e
-        except (TimeoutError, ConnectionError) as e:
-            logger.error(f"Connection error invoking LLM: {e}")
-            raise ProviderError(f"Failed to invoke LLM: {e}") from e
-        except ValueError as e:
-            logger.error(f"Invalid input to LLM: {e}")
-            raise ProviderError(f"Failed to invoke LLM: {e}") from e
-
-    def stream(self, prompt: str) -> Iterator[str]:
+            response = self._invoke(prompt)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _invoke(self, prompt: str | list[BaseMessage]) -> str:
+        """Send a prompt to the LLM without coalescing.
+
+        Args:
+            prompt: The input prompt, or a list of chat messages
+
+        Returns:
+            The model's response as a string
+
+        Raises:
+            ProviderError: If the LLM request fails
+        """
+        with _provider_errors("invoke", "invoking"):
+            return self.llm.invoke(prompt).content
+
+    def _with_max_tokens(self, max_tokens: int):
+        """Get a copy of the chat model with a different completion token limit."""
+        field = "num_predict" if self.config.platform == "ollama" else "max_tokens"
+        return self.llm.model_copy(update={field: max_tokens})
+
+    async def _ainvoke(self, llm, prompt: str | list[BaseMessage]) -> str:
+        """Send a prompt to the given chat model asynchronously.
+
+        Args:
+            llm: Chat model to call
+            prompt: The input prompt, or a list of chat messages
+
+        Returns:
+            The model's response as a string
+
+        Raises:
+            ProviderError: If the LLM request fails
+        """
+        with _provider_errors("invoke", "invoking"):
+            return (await llm.ainvoke(prompt)).content
+
+    async def ainvoke_many(
+        self, prompts: list[str | list[BaseMessage]], max_tokens: list[int]
+    ) -> list[str]:
+        """Send a batch of prompts, grouped by their completion token limits.
+
+        Prompts are sorted into bins LLM_BATCH_BIN_WIDTH tokens wide by max_tokens.
+        Each bin is sent concurrently and the bins one after another, so requests
+        the server handles together have similar lengths and fewer stragglers.
+
+        Args:
+            prompts: Input prompts, or lists of chat messages
+            max_tokens: Completion token limit for each prompt
+
+        Returns:
+            The model's responses, in the same order as prompts
+
+        Raises:
+            ValueError: If prompts and max_tokens differ in length
+            ProviderError: If any LLM request fails
+        """
+        if len(prompts) != len(max_tokens):
+            raise ValueError("prompts and max_tokens must have the same length")
+
+        order = sorted(range(len(prompts)), key=max_tokens.__getitem__)
+        results: list[str] = [""] * len(prompts)
+
+        for _, group in itertools.groupby(
+            order, key=lambda i: max_tokens[i] // LLM_BATCH_BIN_WIDTH
+        ):
+            indices = list(group)
+            logger.debug(f"Dispatching bin of {len(indices)} LLM requests")
+            responses = await asyncio.gather(
+                *(self._ainvoke(self._with_max_tokens(max_tokens[i]), prompts[i]) for i in indices)
+            )
+            for i, response in zip(indices, responses, strict=True):
+                results[i] = response
+
+        return results
+
+    def stream(self, prompt: str | list[BaseMessage]) -> Iterator[str]:
         """Stream a response from the LLM.
 
         Args:
-            prompt: The input prompt
+            prompt: The input prompt, or a list of chat messages
 
         Yields:
             Response chunks as strings
@@ -110,18 +295,34 @@ class UnifiedLLMClient:
         Raises:
             ProviderError: If the LLM streaming fails
         """
-        try:
+        with _provider_errors("stream from", "streaming from"):
+            # Chat models stream message chunks; anything else is passed on as text
             for chunk in self.llm.stream(prompt):
-                if hasattr(chunk, "content"):
-                    yield chunk.content
-                else:
-                    yield str(chunk)
-        except (requests.RequestException, httpx.HTTPError) as e:
-            logger.error(f"HTTP error streaming from LLM: {e}")
-            raise ProviderError(f"Failed to stream from LLM: {e}") from e
-        except (TimeoutError, ConnectionError) as e:
-            logger.error(f"Connection error streaming from LLM: {e}")
-            raise ProviderError(f"Failed to stream from LLM: {e}") from e
-        except ValueError as e:
-            logger.error(f"Invalid input to LLM: {e}")
-            raise ProviderError(f"Failed to stream from LLM: {e}") from e
+                yield chunk.content if isinstance(chunk, BaseMessageChunk) else str(chunk)
+
+
+# One client per config file for the whole process (thread-safe lazy init)
+_client_cache: dict[str, UnifiedLLMClient] = {}
+_client_lock = threading.Lock()
+
+
+def get_llm_client(config_path: str = "config.yaml") -> UnifiedLLMClient:
+    """Get the shared LLM client for a config file, creating it on first use.
+
+    Building a client parses and validates the config and constructs the chat
+    model with its HTTP transport, so nodes share one instance per process.
+
+    Args:
+        config_path: Path to YAML configuration file
+
+    Returns:
+        Shared UnifiedLLMClient instance
+    """
+    client = _client_cache.get(config_path)
+    if client is None:
+        with _client_lock:
+            # Double-check locking pattern
+            client = _client_cache.get(config_path)
+            if client is None:
+                client = _client_cache[config_path] = UnifiedLLMClient(config_path)
+    return client
@@ -2,7 +2,7 @@
 
 import os
 
-from dotenv import load_dotenv
+from src.config import load_env_file
 
 
 class LLMClientError(Exception):
@@ -42,7 +42,8 @@ def load_env_var(key: str, required: bool = True) -> str | None:
     Raises:
         APIKeyError: If required variable is missing
     """
-    load_dotenv()
+    # A no-op once .env has been read (at src.config import, normally)
+    load_env_file()
 
     value = os.getenv(key)
 
@@ -2,7 +2,14 @@
 
 from .answer_generator import answer_generator
 from .query_classifier import query_classifier
-from .retriever import retriever
+from .retriever import base_retriever, context_builder, retriever
 from .web_search import web_search
 
-__all__ = ["query_classifier", "retriever", "web_search", "answer_generator"]
+__all__ = [
+    "query_classifier",
+    "base_retriever",
+    "retriever",
+    "web_search",
+    "context_builder",
+    "answer_generator",
+]
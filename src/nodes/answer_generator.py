@@ -1,19 +1,72 @@
 """Answer generation node."""
 
+import io
+from string import Formatter
+
+from langchain_core.messages import HumanMessage
 from loguru import logger
 
-from src.common.constants import CHAT_HISTORY_CONTEXT_LENGTH
-from src.common.prompts import SYSTEM_PROMPT
-from src.llm_client import UnifiedLLMClient
+from src.common.constants import CHAT_HISTORY_CONTEXT_LENGTH, MAX_CONTEXT_CHARS
+from src.common.prompts import SYSTEM_PROMPT, USER_PROMPT
+from src.common.types import ChatMessage
+from src.llm_client import get_llm_client
 from src.llm_client.utils import LLMClientError, ProviderError
 from src.state import AgentState
 
+# USER_PROMPT split once into its literal parts and placeholder names, so each
+# request joins the parts with the values instead of re-parsing the template
+_USER_PROMPT_PARTS = tuple(
+    (literal, field) for literal, field, _, _ in Formatter().parse(USER_PROMPT)
+)
+
+
+# Display labels for the known chat roles; others fall back to capitalize()
+_ROLE_LABELS = {"user": "User", "assistant": "Assistant", "system": "System"}
+
+
+def build_user_message(**values: str) -> str:
+    """Fill USER_PROMPT; equivalent to USER_PROMPT.format(**values).
+
+    Args:
+        **values: Text for each placeholder (context, chat_history, query)
+
+    Returns:
+        The filled-in user message
+    """
+    pieces = []
+    for literal, field in _USER_PROMPT_PARTS:
+        pieces.append(literal)
+        if field is not None:
+            pieces.append(values[field])
+    return "".join(pieces)
+
+
+def truncate_context(context: str, max_chars: int = MAX_CONTEXT_CHARS) -> str:
+    """Cap the context size so an oversized retrieval cannot blow up the prompt.
+
+    Context is ordered from most to least relevant (web results, then documents
+    by source priority), so the head is kept, cut back to a line boundary.
+
+    Args:
+        context: Combined retrieval context
+        max_chars: Maximum number of characters to keep
+
+    Returns:
+        The context, truncated if it was longer than max_chars
+    """
+    if len(context) <= max_chars:
+        return context
+
+    cut = context.rfind("\n", 0, max_chars)
+    logger.debug("Truncating context from {} to {} chars", len(context), max_chars)
+    return context[: cut if cut > 0 else max_chars]
+
 
-def format_chat_history(history: list) -> str:
+def format_chat_history(history: list[ChatMessage]) -> str:
     """Format chat history for the prompt.
 
     Args:
-        history: List of message dictionaries with 'role' and 'content'
+        history: List of previous chat messages
 
     Returns:
         Formatted chat history string
@@ -21,13 +74,15 @@ def format_chat_history(history: list) -> str:
     if not history:
         return "No previous conversation."
 
-    formatted = []
+    formatted = io.StringIO()
     for msg in history[-CHAT_HISTORY_CONTEXT_LENGTH:]:
-        role = msg.get("role", "user").capitalize()
-        content = msg.get("content", "")
-        formatted.append(f"{role}: {content}")
+        if formatted.tell():
+            formatted.write("\n")
+        formatted.write(_ROLE_LABELS.get(msg.role) or msg.role.capitalize())
+        formatted.write(": ")
+        formatted.write(msg.content)
 
-    return "\n".join(formatted)
+    return formatted.getvalue()
 
 
 def answer_generator(state: AgentState) -> dict:
@@ -37,31 +92,38 @@ def answer_generator(state: AgentState) -> dict:
         state: Current agent state with query and context
 
     Returns:
-        Updated state with response
+        Updated state with response, and error if generation failed
     """
     query = state["query"]
-    context = state.get("context", "No context available.")
+    context = truncate_context(state.get("context") or "No context available.")
     chat_history = state.get("chat_history", [])
 
-    logger.debug(f"Context length: {len(context)} chars")
-    logger.debug(f"Context preview: {context[:500]}...")
+    # The preview slice is only taken if the record is emitted
+    logger.debug("Context length: {} chars", len(context))
+    logger.opt(lazy=True).debug("Context preview: {}...", lambda: context[:500])
 
     try:
-        client = UnifiedLLMClient()
+        client = get_llm_client()
 
-        system_message = SYSTEM_PROMPT.format(
-            context=context, chat_history=format_chat_history(chat_history)
+        # Static system prompt first (cacheable prefix), all per-turn content last
+        user_message = build_user_message(
+            context=context, chat_history=format_chat_history(chat_history), query=query
         )
 
-        prompt = f"{system_message}\n\nUser Question: {query}"
+        messages = [client.system_message(SYSTEM_PROMPT), HumanMessage(content=user_message)]
 
-        response = client.invoke(prompt)
+        # Streamed so the tokens reach graph stream consumers as they are generated
+        response = io.StringIO()
+        for token in client.stream(messages):
+            response.write(token)
 
-        return {"response": response}
+        return {"response": response.getvalue()}
 
     except ProviderError as e:
         logger.error(f"LLM provider error: {e}")
-        return {"response": f"Error: LLM provider unavailable. {e}"}
+        error = f"Error: LLM provider unavailable. {e}"
+        return {"response": error, "error": error}
     except LLMClientError as e:
         logger.error(f"LLM client error: {e}")
-        return {"response": f"Error: Unable to generate response. {e}"}
+        error = f"Error: Unable to generate response. {e}"
+        return {"response": error, "error": error}
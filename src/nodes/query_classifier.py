@@ -1,13 +1,78 @@
 """Query classification node."""
 
+import sys
+import threading
+from collections import OrderedDict
+
 from loguru import logger
 
-from src.common.constants import DEFAULT_QUERY_TYPE, VALID_QUERY_TYPES
+from src.common.constants import (
+    CLASSIFICATION_CACHE_SIZE,
+    DEFAULT_QUERY_TYPE,
+    VALID_QUERY_TYPES,
+)
 from src.common.prompts import CLASSIFICATION_PROMPT
-from src.llm_client import UnifiedLLMClient
+from src.llm_client import get_llm_client
 from src.llm_client.utils import LLMClientError
 from src.state import AgentState
 
+# Recent classifications: normalized query -> query type, least recently used first
+_classification_cache: OrderedDict[str, str] = OrderedDict()
+_classification_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for classification: lowercase, with whitespace collapsed.
+
+    Args:
+        query: The user's query
+
+    Returns:
+        Normalized query, shared by queries differing only in case or spacing
+    """
+    return " ".join(query.lower().split())
+
+
+def classify_query(query: str) -> str:
+    """Classify a query with the LLM.
+
+    Results are cached by the normalized query, so a repeated question skips the
+    LLM call even if its case or spacing differs; on a miss the LLM sees the query
+    as the user wrote it. Failures raise instead of returning, so they are not
+    cached and the next call retries.
+
+    Args:
+        query: The user's query
+
+    Returns:
+        One of VALID_QUERY_TYPES
+
+    Raises:
+        LLMClientError: If the LLM request fails
+    """
+    key = normalize_query(query)
+    with _classification_cache_lock:
+        query_type = _classification_cache.get(key)
+        if query_type is not None:
+            _classification_cache.move_to_end(key)
+            return query_type
+
+    response = get_llm_client().invoke(CLASSIFICATION_PROMPT.format(query=query))
+    query_type = response.strip().lower()
+
+    # Validate the classification; default to langgraph if it is unclear.
+    # Intern so downstream comparisons against the literals are identity checks.
+    query_type = sys.intern(query_type) if query_type in VALID_QUERY_TYPES else DEFAULT_QUERY_TYPE
+
+    with _classification_cache_lock:
+        _classification_cache[key] = query_type
+        _classification_cache.move_to_end(key)
+        # Evict the least recently used entries first
+        while len(_classification_cache) > CLASSIFICATION_CACHE_SIZE:
+            _classification_cache.popitem(last=False)
+
+    return query_type
+
 
 def query_classifier(state: AgentState) -> dict:
     """Classify the user's query to determine the best retrieval strategy.
@@ -18,19 +83,8 @@ def query_classifier(state: AgentState) -> dict:
     Returns:
         Updated state with query_type
     """
-    query = state["query"]
-
     try:
-        client = UnifiedLLMClient()
-
-        response = client.invoke(CLASSIFICATION_PROMPT.format(query=query))
-        query_type = response.strip().lower()
-
-        # Validate the classification
-        if query_type not in VALID_QUERY_TYPES:
-            # Default to langgraph if classification is unclear
-            query_type = DEFAULT_QUERY_TYPE
-
+        query_type = classify_query(state["query"])
     except LLMClientError as e:
         logger.warning(f"Classification failed, using default: {e}")
         query_type = DEFAULT_QUERY_TYPE
@@ -1,12 +1,14 @@
 """Document retrieval node."""
 
+import io
 import threading
+from itertools import chain, islice
 
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from loguru import logger
 
-from src.common.constants import DEDUP_KEY_LENGTH, MAX_TOTAL_DOCS, TOP_K_RESULTS
+from src.common.constants import MAX_TOTAL_DOCS, TOP_K_RESULTS
 from src.data_prep.vectorstore import load_vectorstore
 from src.state import AgentState
 
@@ -22,6 +24,28 @@ SOURCE_PRIORITY = {
     "general": ["langgraph_full", "langchain_full", "langgraph", "langchain"],
 }
 
+# Rank of each source per query type, for one dict lookup per document
+SOURCE_PRIORITY_INDEX = {
+    query_type: {source: rank for rank, source in enumerate(sources)}
+    for query_type, sources in SOURCE_PRIORITY.items()
+}
+
+
+# Search query templates. The base ones run for every query type (always including a
+# Python-focused query since we're a Python project); the type-specific ones run
+# once the query is classified. Types without an entry only use the base queries.
+BASE_QUERY_TEMPLATES = ("{query}", "Python {query}")
+QUERY_TEMPLATES = {
+    "langgraph": (
+        "LangGraph Python {query}",
+        "from langgraph {query}",
+        "builder.compile {query}",
+        "StateGraph {query}",
+    ),
+    "langchain": ("LangChain Python {query}", "from langchain {query}"),
+    "code_example": ("Python code example {query}", "def {query}"),
+}
+
 
 def get_vectorstore() -> FAISS | None:
     """Get the vector store, loading it if necessary (thread-safe).
@@ -50,58 +74,78 @@ def format_docs(docs: list[Document]) -> str:
     if not docs:
         return "No relevant documentation found."
 
-    formatted = []
+    formatted = io.StringIO()
     for doc in docs:
-        source = doc.metadata.get("source", "unknown")
-        formatted.append(f"[Source: {source}]\n{doc.page_content}")
+        if formatted.tell():
+            formatted.write("\n\n---\n\n")
+        formatted.write(f"[Source: {doc.metadata.get('source', 'unknown')}]\n")
+        formatted.write(doc.page_content)
 
-    return "\n\n---\n\n".join(formatted)
+    return formatted.getvalue()
 
 
-def prioritize_docs(docs: list[Document], query_type: str) -> list[Document]:
+def prioritize_docs(
+    docs: list[Document], query_type: str, limit: int | None = None
+) -> list[Document]:
     """Reorder documents based on source priority for the query type.
 
     Args:
         docs: List of retrieved documents
         query_type: Type of query (langgraph, langchain, code_example, general)
+        limit: Keep only this many of the highest-priority documents (all if None)
 
     Returns:
         Reordered list of documents
     """
-    priority = SOURCE_PRIORITY.get(query_type, SOURCE_PRIORITY["general"])
+    priority = SOURCE_PRIORITY_INDEX.get(query_type, SOURCE_PRIORITY_INDEX["general"])
 
-    def get_priority(doc: Document) -> int:
-        source = doc.metadata.get("source", "unknown")
-        try:
-            return priority.index(source)
-        except ValueError:
-            return len(priority)  # Unknown sources go last
+    # Stable bucket sort: one bucket per rank, plus one for unknown sources (last)
+    buckets = [[] for _ in range(len(priority) + 1)]
+    for doc in docs:
+        buckets[priority.get(doc.metadata.get("source", "unknown"), len(priority))].append(doc)
 
-    return sorted(docs, key=get_priority)
+    # The top documents are taken straight from the buckets, without building the
+    # full reordered list first
+    return list(islice(chain.from_iterable(buckets), limit))
 
 
 def multi_query_search(
-    vectorstore, queries: list[str], k_per_query: int, max_total: int = MAX_TOTAL_DOCS
+    vectorstore,
+    queries: list[str],
+    k_per_query: int,
+    max_total: int = MAX_TOTAL_DOCS,
+    found: list[Document] | None = None,
 ) -> list[Document]:
     """Search with multiple queries and deduplicate results.
 
+    All queries are embedded in one batched call, then each vector is searched.
+
     Args:
         vectorstore: The vector store to search
         queries: List of search queries
         k_per_query: Number of results per query
         max_total: Maximum total documents to return (prevents unbounded growth)
+        found: Results of earlier queries to extend; new results are deduplicated
+            against them and appended after them
 
     Returns:
         Deduplicated list of documents, capped at max_total
     """
-    seen_content = set()
-    all_docs = []
+    all_docs = list(found) if found else []
+    # Dedup on the hash of the full content: an int per entry, no key copies. The
+    # set only lives for this call, so the per-process string hash salt is fine.
+    seen_content: set[int] = {hash(doc.page_content) for doc in all_docs}
+
+    if len(all_docs) >= max_total or not queries:
+        return all_docs
+
+    # One embedding request for every query instead of one per search
+    query_vectors = vectorstore.embeddings.embed_documents(queries)
 
-    for query in queries:
-        docs = vectorstore.similarity_search(query, k=k_per_query)
+    for query_vector in query_vectors:
+        docs = vectorstore.similarity_search_by_vector(query_vector, k=k_per_query)
         for doc in docs:
-            # Use first N chars as dedup key
-            content_key = doc.page_content[:DEDUP_KEY_LENGTH]
+            content_key = hash(doc.page_content)
             if content_key not in seen_content:
                 seen_content.add(content_key)
                 all_docs.append(doc)
@@ -113,6 +157,38 @@ def multi_query_search(
     return all_docs
 
 
+def base_search_queries(query: str) -> list[str]:
+    """Search queries used for every query type.
+
+    Args:
+        query: The user's query
+
+    Returns:
+        Search queries that do not depend on the classification
+    """
+    return [template.format(query=query) for template in BASE_QUERY_TEMPLATES]
+
+
+def base_retriever(state: AgentState) -> dict:
+    """Run the classification-independent searches.
+
+    Runs alongside query_classifier, so these searches (and loading the vector
+    store on the first query) overlap the classifier's LLM call.
+
+    Args:
+        state: Current agent state with the user's query
+
+    Returns:
+        Updated state with base_docs
+    """
+    vectorstore = get_vectorstore()
+    if vectorstore is None:
+        return {"base_docs": []}
+
+    docs = multi_query_search(vectorstore, base_search_queries(state["query"]), TOP_K_RESULTS)
+    return {"base_docs": docs}
+
+
 def retriever(state: AgentState) -> dict:
     """Retrieve relevant documents from the vector store.
 
@@ -120,67 +196,65 @@ def retriever(state: AgentState) -> dict:
         state: Current agent state with the user's query
 
     Returns:
-        Updated state with retrieved_docs and context
+        Updated state with retrieved_docs
     """
     query = state["query"]
     query_type = state.get("query_type", "general")
-    web_results = state.get("web_results", [])
 
     vectorstore = get_vectorstore()
 
     if vectorstore is None:
-        context = "Vector store not available. Please run: python scripts/prepare_data.py"
-        return {"retrieved_docs": [], "context": context}
+        return {"retrieved_docs": []}
 
-    # Build multiple search queries for better coverage
-    # Always include Python-focused queries since we're a Python project
+    # Type-specific search queries for better coverage; the shared ones already
+    # ran in base_retriever
     search_queries = [
-        query,
-        f"Python {query}",
+        template.format(query=query) for template in QUERY_TEMPLATES.get(query_type, ())
     ]
 
-    if query_type == "langgraph":
-        search_queries.extend(
-            [
-                f"LangGraph Python {query}",
-                f"from langgraph {query}",
-                f"builder.compile {query}",
-                f"StateGraph {query}",
-            ]
-        )
-    elif query_type == "langchain":
-        search_queries.extend(
-            [
-                f"LangChain Python {query}",
-                f"from langchain {query}",
-            ]
-        )
-    elif query_type == "code_example":
-        search_queries.extend(
-            [
-                f"Python code example {query}",
-                f"def {query}",
-            ]
-        )
-
-    # Multi-query search with deduplication
+    # Multi-query search with deduplication, continuing from the shared searches
+    base_docs = state.get("base_docs")
+    if base_docs is None:
+        search_queries[:0] = base_search_queries(query)
     k_per_query = TOP_K_RESULTS
-    docs = multi_query_search(vectorstore, search_queries, k_per_query)
+    docs = multi_query_search(vectorstore, search_queries, k_per_query, found=base_docs)
 
-    # Prioritize docs based on query type
-    docs = prioritize_docs(docs, query_type)
+    # Prioritize docs based on query type, keeping only the top K
+    docs = prioritize_docs(docs, query_type, limit=TOP_K_RESULTS)
 
-    # Keep only top K after prioritization
-    docs = docs[:TOP_K_RESULTS]
+    # Arguments are only formatted if the record is emitted (DEBUG is off by default);
+    # the per-document previews are built by one lazy call instead of a record each
+    logger.debug("Query type: {}, queries: {}", query_type, len(search_queries))
+    logger.debug("Retrieved {} documents (prioritized for {})", len(docs), query_type)
+    logger.opt(lazy=True).debug(
+        "Retrieved documents:\n{}",
+        lambda: "\n".join(
+            f"Doc {i} [{doc.metadata.get('source', 'unknown')}]: {doc.page_content[:100]}..."
+            for i, doc in enumerate(docs, 1)
+        ),
+    )
+
+    return {"retrieved_docs": docs}
+
+
+def context_builder(state: AgentState) -> dict:
+    """Combine the web results and retrieved documents into the answer context.
+
+    In online mode, web_search and retriever run concurrently and this node
+    joins their results.
+
+    Args:
+        state: Current agent state with retrieved_docs and web_results
+
+    Returns:
+        Updated state with context
+    """
+    if get_vectorstore() is None:
+        return {"context": "Vector store not available. Please run: python scripts/prepare_data.py"}
 
-    logger.debug(f"Query type: {query_type}, queries: {len(search_queries)}")
-    logger.debug(f"Retrieved {len(docs)} documents (prioritized for {query_type})")
-    for i, doc in enumerate(docs):
-        logger.debug(
-            f"Doc {i + 1} [{doc.metadata.get('source', 'unknown')}]: {doc.page_content[:100]}..."
-        )
+    web_results = state.get("web_results")
+    docs = state.get("retrieved_docs")
 
-    # Combine with web results if available
     context_parts = []
 
     if web_results:
@@ -191,4 +265,4 @@ def retriever(state: AgentState) -> dict:
 
     context = "\n\n".join(context_parts) if context_parts else "No relevant information found."
 
-    return {"retrieved_docs": docs, "context": context}
+    return {"context": context}
@@ -1,13 +1,84 @@
 """Web search node for online mode."""
 
-from ddgs import DDGS
-from ddgs.exceptions import DDGSException, RatelimitException, TimeoutException
+import threading
+import time
+from collections import OrderedDict
+
 from loguru import logger
 from requests.exceptions import RequestException
 
-from src.common.constants import DDGS_REGION, MAX_SEARCH_RESULTS
+from src.common.constants import (
+    DDGS_REGION,
+    MAX_SEARCH_RESULTS,
+    WEB_SEARCH_CACHE_SIZE,
+    WEB_SEARCH_CACHE_TTL,
+)
 from src.state import AgentState
 
+# Recent searches: search query -> (expiry time, formatted results), oldest first
+_search_cache: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+# Search client shared by every web search (thread-safe lazy init)
+_ddgs_client = None
+_ddgs_lock = threading.Lock()
+
+
+def _get_ddgs():
+    """Get the shared DDGS client, creating it on first use.
+
+    DDGS keeps the HTTP session of each search engine it has used, so reusing one
+    instance lets later searches skip the TCP and TLS handshakes. It is imported
+    here, so offline sessions never load the search client.
+
+    Returns:
+        Shared DDGS instance
+    """
+    global _ddgs_client
+    if _ddgs_client is None:
+        with _ddgs_lock:
+            # Double-check locking pattern
+            if _ddgs_client is None:
+                from ddgs import DDGS
+
+                _ddgs_client = DDGS()
+    return _ddgs_client
+
+
+def _get_cached_results(search_query: str) -> list[str] | None:
+    """Get the results of a recent identical search, if still fresh.
+
+    Args:
+        search_query: The search query sent to DuckDuckGo
+
+    Returns:
+        Formatted results, or None if not cached or expired
+    """
+    with _search_cache_lock:
+        entry = _search_cache.get(search_query)
+        if entry is None:
+            return None
+        expires_at, web_results = entry
+        if expires_at < time.monotonic():
+            del _search_cache[search_query]
+            return None
+        return web_results
+
+
+def _cache_results(search_query: str, web_results: list[str]):
+    """Remember the results of a search for WEB_SEARCH_CACHE_TTL seconds.
+
+    Args:
+        search_query: The search query sent to DuckDuckGo
+        web_results: Formatted results of the search
+    """
+    with _search_cache_lock:
+        _search_cache[search_query] = (time.monotonic() + WEB_SEARCH_CACHE_TTL, web_results)
+        _search_cache.move_to_end(search_query)
+        # Evict the oldest entries first; they expire first too
+        while len(_search_cache) > WEB_SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
 
 def web_search(state: AgentState) -> dict:
     """Search the web for relevant information.
@@ -29,19 +100,26 @@ def web_search(state: AgentState) -> dict:
     else:
         search_query = f"LangGraph LangChain {query}"
 
-    logger.debug(f"Web search query: '{search_query}'")
+    logger.debug("Web search query: '{}'", search_query)
+
+    cached = _get_cached_results(search_query)
+    if cached is not None:
+        logger.debug("Web search cache hit: {} results", len(cached))
+        return {"web_results": list(cached)}
+
+    ddgs = _get_ddgs()
+    from ddgs.exceptions import DDGSException, RatelimitException, TimeoutException
 
     try:
-        with DDGS() as ddgs:
-            results = list(
-                ddgs.text(
-                    search_query,
-                    max_results=MAX_SEARCH_RESULTS,
-                    region=DDGS_REGION,
-                )
+        results = list(
+            ddgs.text(
+                search_query,
+                max_results=MAX_SEARCH_RESULTS,
+                region=DDGS_REGION,
             )
+        )
 
-        logger.debug(f"Web search returned {len(results)} results")
+        logger.debug("Web search returned {} results", len(results))
 
         # Format results
         web_results = []
@@ -56,8 +134,10 @@ def web_search(state: AgentState) -> dict:
                     formatted += f"\nSource: {href}"
                 web_results.append(formatted)
 
-        logger.debug(f"Formatted {len(web_results)} web results")
-        return {"web_results": web_results}
+        logger.debug("Formatted {} web results", len(web_results))
+        # Failed searches are not cached, so the next identical query retries
+        _cache_results(search_query, web_results)
+        return {"web_results": list(web_results)}
 
     except RatelimitException as e:
         logger.warning(f"DuckDuckGo rate limit exceeded: {e}")
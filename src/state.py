@@ -4,6 +4,8 @@ from typing import Literal, TypedDict
 
 from langchain_core.documents import Document
 
+from src.common.types import ChatMessage
+
 
 class AgentState(TypedDict):
     """State shared across all nodes in the graph.
@@ -12,10 +14,12 @@ class AgentState(TypedDict):
         query: The user's original question
         query_type: Classification of the query (langgraph, langchain, code_example, general)
         mode: Current agent mode (offline or online)
+        base_docs: Results of the classification-independent searches
         retrieved_docs: Documents retrieved from the vector store
         web_results: Results from web search (online mode only)
         context: Combined context from retrieval and/or web search
         response: The final generated response
+        error: Error message if answer generation failed (also set as the response)
         chat_history: Optional list of previous messages for memory
     """
 
@@ -29,12 +33,14 @@ class AgentState(TypedDict):
     mode: Literal["offline", "online"]
 
     # Retrieval
+    base_docs: list[Document] | None
     retrieved_docs: list[Document] | None
     web_results: list[str] | None
     context: str | None
 
     # Output
     response: str | None
+    error: str | None
 
     # Memory (optional)
-    chat_history: list[dict] | None
+    chat_history: list[ChatMessage] | None
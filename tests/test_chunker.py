@@ -0,0 +1,68 @@
+"""Tests for the single-pass text splitter and parallel chunking."""
+
+import random
+
+from src.common.constants import CHUNK_OVERLAP, CHUNK_SIZE
+from src.data_prep.chunker import SinglePassSplitter, chunk_text, iter_chunks
+
+
+def _paragraph_then_code_block() -> str:
+    """A short paragraph followed by a code block longer than one chunk."""
+    code = "\n".join(
+        f"value_{i} = compute(value_{i - 1}, option={i})  # step {i}" for i in range(60)
+    )
+    return "Intro paragraph " * 10 + "\n\n```python\n" + code + "\n```\n"
+
+
+def _assert_no_repeated_tails(chunks: list[str]):
+    """Neighbouring chunks share at most the overlap, and no chunk repeats its predecessor."""
+    for previous, current in zip(chunks, chunks[1:], strict=False):
+        assert current not in previous
+        shared = max(
+            (
+                n
+                for n in range(1, min(len(previous), len(current)) + 1)
+                if previous.endswith(current[:n])
+            ),
+            default=0,
+        )
+        assert shared <= CHUNK_OVERLAP
+
+
+def test_cut_after_overlap_does_not_repeat_previous_separator():
+    text = _paragraph_then_code_block()
+    chunks = SinglePassSplitter().split_text(text)
+
+    # Paragraph, then the code block in two pieces (with some overlap), not a run
+    # of ever-shorter copies of the paragraph's tail
+    assert len(chunks) <= len(text) // (CHUNK_SIZE - CHUNK_OVERLAP) + 2
+    _assert_no_repeated_tails(chunks)
+
+
+def test_chunk_count_on_random_text():
+    # Lines of words with an occasional paragraph break, rarer than one per chunk
+    rng = random.Random(0)
+    words = ["\n\n"] + ["lorem", "ipsum", "\n"] * 60
+    text = " ".join(rng.choice(words) for _ in range(6000))
+    chunks = SinglePassSplitter().split_text(text)
+
+    assert all(len(chunk) <= CHUNK_SIZE for chunk in chunks)
+    assert len(chunks) <= 1.5 * len(text) / (CHUNK_SIZE - CHUNK_OVERLAP)
+    _assert_no_repeated_tails(chunks)
+
+
+def test_iter_chunks_reads_a_bounded_window_of_docs():
+    docs = [(f"doc{i}", f"Document {i} " * 200) for i in range(6)]
+    read = []
+
+    def reading():
+        for doc in docs:
+            read.append(doc[0])
+            yield doc
+
+    chunks = iter_chunks(reading(), processes=2)
+    first = next(chunks)
+
+    # The first source's chunks arrive before more than a pool's worth of docs is read
+    assert len(read) == 2
+    assert [first, *chunks] == [chunk for doc in docs for chunk in chunk_text(doc[1], doc[0])]
@@ -0,0 +1,56 @@
+"""Tests for configuration loading."""
+
+import json
+
+import pytest
+
+from src.general_utils.config_loader import load_yaml_config, render_json_config
+
+YAML = b"llm:\n  platform: ollama\n  model:\n    name: yaml-model\n  stop: [a, b]\n"
+
+
+def _set_model_name(json_path, name: str):
+    """Change the model name in a JSON rendering, keeping its stored YAML digest."""
+    rendering = json.loads(json_path.read_text())
+    rendering["config"]["llm"]["model"]["name"] = name
+    json_path.write_text(json.dumps(rendering))
+
+
+def test_rendering_matches_the_yaml(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_bytes(YAML)
+    from_yaml = load_yaml_config(str(path))
+
+    render_json_config(str(path))
+
+    assert load_yaml_config(str(path)) == from_yaml
+
+
+def test_json_rendering_of_current_yaml_is_used(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_bytes(YAML)
+    assert load_yaml_config(str(path))["llm"]["model"]["name"] == "yaml-model"
+
+    # A rendering written after the YAML was first loaded is still picked up
+    _set_model_name(render_json_config(str(path)), "json-model")
+
+    assert load_yaml_config(str(path))["llm"]["model"]["name"] == "json-model"
+
+
+def test_stale_json_rendering_is_ignored(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_bytes(YAML.replace(b"yaml-model", b"old-model"))
+    render_json_config(str(path))
+    path.write_bytes(YAML)
+
+    assert load_yaml_config(str(path))["llm"]["model"]["name"] == "yaml-model"
+
+
+def test_nested_values_are_read_only(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_bytes(YAML)
+    config = load_yaml_config(str(path))
+
+    with pytest.raises(TypeError):
+        config["llm"]["model"]["name"] = "other"
+    assert config["llm"]["stop"] == ("a", "b")
@@ -0,0 +1,54 @@
+"""Tests for running the agent graph."""
+
+import sys
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+import src.nodes  # noqa: F401 - registers the node submodules in sys.modules
+from src.graph import get_graph, run_agent_stream
+from src.llm_client import UnifiedLLMClient
+
+
+class FailingMidStreamModel(GenericFakeChatModel):
+    """Streams a few tokens, then loses the connection."""
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for token in ("Partial", " answer"):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        raise ConnectionError("connection reset")
+
+
+def _use_model(monkeypatch, model):
+    client = UnifiedLLMClient("config.yaml")
+    client.llm = model
+    monkeypatch.setattr(sys.modules["src.nodes.answer_generator"], "get_llm_client", lambda: client)
+    monkeypatch.setattr(
+        sys.modules["src.nodes.query_classifier"], "classify_query", lambda q: "general"
+    )
+    monkeypatch.setattr(sys.modules["src.nodes.retriever"], "get_vectorstore", lambda: None)
+
+
+def test_error_after_streamed_tokens_is_shown(monkeypatch):
+    _use_model(monkeypatch, FailingMidStreamModel(messages=iter([])))
+
+    response = "".join(run_agent_stream("How do I build a StateGraph?"))
+
+    assert response.startswith("Partial answer")
+    assert "Error: LLM provider unavailable" in response
+
+
+def test_streamed_answer_is_not_repeated(monkeypatch):
+    _use_model(monkeypatch, GenericFakeChatModel(messages=iter([AIMessage("Full answer")])))
+
+    assert "".join(run_agent_stream("How do I build a StateGraph?")) == "Full answer"
+
+
+def test_retriever_waits_for_base_retriever():
+    edges = {(edge.source, edge.target) for edge in get_graph().get_graph().edges}
+
+    assert ("base_retriever", "retriever") in edges
@@ -0,0 +1,68 @@
+"""Tests for the unified LLM client."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from src.llm_client import UnifiedLLMClient
+from src.llm_client.utils import ProviderError
+
+
+class EchoModel(BaseChatModel):
+    """Answers with the prompt and its token limit, logging when each call starts and ends."""
+
+    num_predict: int | None = None
+    events: list[tuple[str, int]] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if messages[0].content == "fail":
+            raise ConnectionError("connection reset")
+        self.events.append(("start", self.num_predict))
+        await asyncio.sleep(0)
+        self.events.append(("end", self.num_predict))
+        message = AIMessage(content=f"{messages[0].content}:{self.num_predict}")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture
+def client():
+    client = UnifiedLLMClient("config.yaml")
+    client.config.platform = "ollama"
+    client.llm = EchoModel()
+    return client
+
+
+def test_ainvoke_many_keeps_order_and_sends_bins_in_turn(client):
+    prompts = ["a", "b", "c", "d"]
+    max_tokens = [1000, 10, 1010, 20]
+
+    responses = asyncio.run(client.ainvoke_many(prompts, max_tokens))
+
+    assert responses == ["a:1000", "b:10", "c:1010", "d:20"]
+    # Each bin's requests are in flight together; the next bin waits for them
+    assert client.llm.events == [
+        ("start", 10),
+        ("start", 20),
+        ("end", 10),
+        ("end", 20),
+        ("start", 1000),
+        ("start", 1010),
+        ("end", 1000),
+        ("end", 1010),
+    ]
+
+
+def test_ainvoke_many_raises_provider_error(client):
+    with pytest.raises(ProviderError):
+        asyncio.run(client.ainvoke_many(["ok", "fail"], [10, 10]))
@@ -0,0 +1,73 @@
+"""Tests for the documentation preprocessing pipeline."""
+
+import re
+
+from src.common.constants import BOILERPLATE_LEAD_PATTERN, BOILERPLATE_REMOVAL_RULES
+from src.data_prep.preprocessor import preprocess_document
+
+
+def test_empty_inline_fence_does_not_shield_js_noise():
+    text = (
+        "Intro text that is long enough to keep.\n"
+        "``` ```\n"
+        "const graph = new StateGraph(schema);\n"
+        "let state = 1\n"
+        "\n"
+        "```python\n"
+        "let inside = 1\n"
+        "```\n"
+    )
+    result = preprocess_document(text, "test")
+
+    # The empty fence is removed and the JS noise after it filtered out, while
+    # the real code block still keeps its contents
+    assert "``` ```" not in result
+    assert "new StateGraph" not in result
+    assert "let state" not in result
+    assert "```python\nlet inside = 1\n```" in result
+
+
+def test_sections_differing_only_in_boilerplate_are_deduplicated():
+    lines = ["Checkpointers persist graph state between runs so a thread can resume."] * 3
+    text = (
+        "## Persistence\n\n"
+        + "\n".join(lines)
+        + "\n\n## Persistence (copy)\n\n<!-- mirrored page -->"
+        + "   \n".join(lines)
+        + "\n\n\n\n\n"
+    )
+    result = preprocess_document(text, "test")
+
+    # Both sections clean up to the same body, so only the first keeps it
+    assert result.count("Checkpointers persist") == 3
+    assert "mirrored page" not in result
+
+
+# One sample per BOILERPLATE_REMOVAL_RULES entry, in order, with matches mid-line and
+# in other letter cases where the rule allows, to exercise every branch of the lead class
+BOILERPLATE_SAMPLES = [
+    "Intro\nDocs > Guides > Persistence\nBody\n",
+    "Intro\n  - [Setup](#setup)\n- [Run](#run)  \nBody\n",
+    "See more. On this page\n- [A](#a)\n- [B](#b)\nBody\nON THIS PAGE\n - [c](#c)\nAlso on this page\n- [d](#d)\n",
+    "Text Skip to main content. skip to content, \u017fKIP TO CONTENT\n",
+    "End. Previous: [Intro](intro.md) next: [Usage](usage.md) NEXT:[x](y) previous: [a](b)\n",
+    "Text [Edit this page on GitHub](url) trailing\n[edit on github] more\nNext line\n",
+    "X Was this page helpful? Yes No\nwas this helpful? no\nKept, was this helpful?\n",
+    "See [](http://x) here [](#top)\n",
+    "a --- --- b\n---\n---\nend\n",
+    "a <!-- hidden\nmultiline --> b <!---->\n",
+    "a <DIV class='x'> b <br/> c <P> d <hr>\n",
+    "a </div> b </SPAN> c </p>\n",
+    "Text ## Parameters\n- **state**: x\n* **config**: y\nAfter\n#### returns\n - **out** z\n",
+    "Intro\n" + "- [Link one](a)\n" * 3 + "* [Link two](b)\n" * 2 + "End\n",
+]
+
+
+def test_boilerplate_lead_keeps_every_rule_behavior():
+    # A rule whose match can start at a position the lead rejects would silently
+    # stop being applied once fused behind it
+    assert len(BOILERPLATE_SAMPLES) == len(BOILERPLATE_REMOVAL_RULES)
+    for (pattern, _), sample in zip(BOILERPLATE_REMOVAL_RULES, BOILERPLATE_SAMPLES, strict=True):
+        expected = re.sub(pattern, "", sample)
+        assert expected != sample, pattern
+        assert re.sub(f"{BOILERPLATE_LEAD_PATTERN}(?:{pattern})", "", sample) == expected, pattern
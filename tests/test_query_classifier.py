@@ -0,0 +1,53 @@
+"""Tests for the query classification node."""
+
+import sys
+from collections import OrderedDict
+
+import pytest
+
+import src.nodes  # noqa: F401 - registers the node submodules in sys.modules
+
+query_classifier = sys.modules["src.nodes.query_classifier"]
+
+
+class RecordingClient:
+    """Answers every prompt with a fixed label and records the prompts."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.prompts: list[str] = []
+
+    def invoke(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.label
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = RecordingClient("LangGraph\n")
+    monkeypatch.setattr(query_classifier, "get_llm_client", lambda: client)
+    monkeypatch.setattr(query_classifier, "_classification_cache", OrderedDict())
+    return client
+
+
+def test_cache_is_keyed_on_normalized_query(client):
+    assert query_classifier.classify_query("How do I use  StateGraph?") == "langgraph"
+    assert query_classifier.classify_query("how do i use stategraph? ") == "langgraph"
+
+    assert len(client.prompts) == 1
+
+
+def test_llm_sees_the_original_query(client):
+    query_classifier.classify_query("What is the  LangChain `Runnable` API?")
+
+    assert "What is the  LangChain `Runnable` API?" in client.prompts[0]
+
+
+def test_least_recently_used_query_is_evicted(client, monkeypatch):
+    monkeypatch.setattr(query_classifier, "CLASSIFICATION_CACHE_SIZE", 2)
+    for query in ("first", "second", "first", "third", "first", "second"):
+        query_classifier.classify_query(query)
+
+    # "second" was the least recently used when "third" was added
+    asked = [prompt.split("Question: ")[1].split("\n")[0] for prompt in client.prompts]
+    assert asked == ["first", "second", "third", "second"]